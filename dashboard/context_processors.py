@@ -0,0 +1,17 @@
+import functools
+
+from django.urls import reverse
+
+
+DASHBOARD_URL_NAMES = ('home', 'neuro_ads', 'social_pulse', 'email_cortex', 'analytics', 'settings', 'data')
+
+
+@functools.lru_cache(maxsize=None)
+def _dashboard_urls():
+    # Resolved on first use - the URLconf is not loaded at import time
+    return {name: reverse(f'dashboard:{name}') for name in DASHBOARD_URL_NAMES}
+
+
+def dashboard_urls(request):
+    """Expose pre-reversed dashboard URLs as {{ dashboard_urls.<name> }}"""
+    return {'dashboard_urls': _dashboard_urls()}
@@ -0,0 +1,58 @@
+"""
+Vectorized rate calculations for dashboard performance tables
+"""
+
+import numpy as np
+from typing import Any, Dict, Sequence, Tuple
+
+from neuro.metrics import safe_ratio
+
+
+def compute_ad_rates(spent: Sequence[float], clicks: Sequence[int], impressions: Sequence[int]) -> Dict[str, np.ndarray]:
+    """Compute CTR and CPC columns for a table of ad campaigns"""
+    spent = np.asarray(spent, dtype=np.float64)
+    clicks = np.asarray(clicks, dtype=np.float64)
+    impressions = np.asarray(impressions, dtype=np.float64)
+
+    return {
+        'ctr': safe_ratio(clicks, impressions, 100.0),
+        'cpc': safe_ratio(spent, clicks),
+    }
+
+
+def compute_email_rates(sent: Sequence[int], opened: Sequence[int], clicked: Sequence[int]) -> Dict[str, np.ndarray]:
+    """Compute open and click rate columns for a table of email campaigns"""
+    sent = np.asarray(sent, dtype=np.float64)
+    opened = np.asarray(opened, dtype=np.float64)
+    clicked = np.asarray(clicked, dtype=np.float64)
+
+    return {
+        'open_rate': safe_ratio(opened, sent, 100.0),
+        'click_rate': safe_ratio(clicked, sent, 100.0),
+    }
+
+
+def with_ad_rates(campaigns: Sequence[Dict[str, Any]]) -> Tuple[Dict[str, Any], ...]:
+    """Return copies of the ad campaign rows with rounded 'ctr' and 'cpc' columns added"""
+    rates = compute_ad_rates(
+        [c['spent'] for c in campaigns],
+        [c['clicks'] for c in campaigns],
+        [c['impressions'] for c in campaigns],
+    )
+    return tuple(
+        {**campaign, 'ctr': round(float(ctr), 1), 'cpc': round(float(cpc), 2)}
+        for campaign, ctr, cpc in zip(campaigns, rates['ctr'], rates['cpc'])
+    )
+
+
+def with_email_rates(campaigns: Sequence[Dict[str, Any]]) -> Tuple[Dict[str, Any], ...]:
+    """Return copies of the email campaign rows with rounded 'open_rate' and 'click_rate' columns added"""
+    rates = compute_email_rates(
+        [c['sent'] for c in campaigns],
+        [c['opened'] for c in campaigns],
+        [c['clicked'] for c in campaigns],
+    )
+    return tuple(
+        {**campaign, 'open_rate': round(float(open_rate), 1), 'click_rate': round(float(click_rate), 1)}
+        for campaign, open_rate, click_rate in zip(campaigns, rates['open_rate'], rates['click_rate'])
+    )
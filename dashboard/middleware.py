@@ -0,0 +1,15 @@
+from django.contrib.auth.views import redirect_to_login
+
+
+class DashboardAuthMiddleware:
+    """Require an authenticated user for every URL under /dashboard/"""
+    
+    path_prefix = '/dashboard/'
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        if request.path.startswith(self.path_prefix) and not request.user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return self.get_response(request)
@@ -0,0 +1,21 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJsonResponse(HttpResponse):
+    """JSON response serialized with orjson, falling back to the stdlib encoder"""
+    
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        if orjson is not None:
+            content = orjson.dumps(data, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            content = json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'))
+        super().__init__(content=content, **kwargs)
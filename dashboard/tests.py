@@ -1,3 +1,168 @@
-from django.test import TestCase
+import json
+from datetime import datetime, timezone
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from . import responses
+from .metrics import with_ad_rates, with_email_rates
+from .responses import ORJsonResponse
+
+
+class DashboardMetricsTests(SimpleTestCase):
+    def test_ad_rates_are_added_to_copies(self):
+        rows = ({'spent': 50.0, 'clicks': 100, 'impressions': 4000},
+                {'spent': 10.0, 'clicks': 0, 'impressions': 0})
+
+        result = with_ad_rates(rows)
+
+        self.assertEqual(result[0]['ctr'], 2.5)
+        self.assertEqual(result[0]['cpc'], 0.5)
+        self.assertEqual((result[1]['ctr'], result[1]['cpc']), (0.0, 0.0))
+        self.assertNotIn('ctr', rows[0])
+
+    def test_email_rates_are_added_to_copies(self):
+        rows = ({'sent': 200, 'opened': 50, 'clicked': 10},)
+
+        result = with_email_rates(rows)
+
+        self.assertEqual((result[0]['open_rate'], result[0]['click_rate']), (25.0, 5.0))
+        self.assertNotIn('open_rate', rows[0])
+
+
+class HomeFragmentCacheTests(TestCase):
+    fragments = ('dashboard_overview_stats', 'dashboard_recent_activities', 'dashboard_quick_actions')
+    
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.alice = User.objects.create_user(username='alice', password='secret', onboarding_completed=True)
+        self.bob = User.objects.create_user(username='bob', password='secret', onboarding_completed=True)
+    
+    def _fragment_keys(self, user):
+        return [make_template_fragment_key(fragment, ['home', user.id]) for fragment in self.fragments]
+    
+    def test_fragments_are_cached_per_user(self):
+        self.client.force_login(self.alice)
+        self.assertEqual(self.client.get(reverse('dashboard:home')).status_code, 200)
+        
+        self.assertTrue(all(cache.get(key) is not None for key in self._fragment_keys(self.alice)))
+        self.assertTrue(all(cache.get(key) is None for key in self._fragment_keys(self.bob)))
+    
+    def test_settings_update_clears_only_the_users_fragments(self):
+        for user in (self.alice, self.bob):
+            self.client.force_login(user)
+            self.client.get(reverse('dashboard:home'))
+        
+        self.client.force_login(self.alice)
+        response = self.client.post(reverse('dashboard:settings'))
+        
+        self.assertRedirects(response, reverse('dashboard:settings'), fetch_redirect_response=False)
+        self.assertTrue(all(cache.get(key) is None for key in self._fragment_keys(self.alice)))
+        self.assertTrue(all(cache.get(key) is not None for key in self._fragment_keys(self.bob)))
+    
+    def test_other_dashboard_pages_do_not_fill_the_home_fragments(self):
+        self.client.force_login(self.alice)
+        self.client.get(reverse('dashboard:settings'))
+        
+        response = self.client.get(reverse('dashboard:home'))
+        
+        self.assertContains(response, '87,350.25')
+        self.assertContains(response, 'Create Campaign')
+        self.assertTrue(all(cache.get(key) is not None for key in self._fragment_keys(self.alice)))
+
+
+class QuickActionTests(TestCase):
+    def test_quick_actions_link_to_the_dashboard_pages(self):
+        cache.clear()
+        self.client.force_login(get_user_model().objects.create_user(
+            username='alice', password='secret', onboarding_completed=True
+        ))
+        
+        response = self.client.get(reverse('dashboard:home'))
+        
+        hrefs = [action['href'] for action in response.context['quick_actions']]
+        self.assertEqual(hrefs, [reverse(f'dashboard:{name}') for name in ('neuro_ads', 'social_pulse', 'email_cortex', 'analytics')])
+        for href in hrefs:
+            self.assertContains(response, f'<a href="{href}" class="flex flex-col')
+
+
+class FeatureFlagTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='alice', password='secret', onboarding_completed=True)
+        self.client.force_login(self.user)
+    
+    def test_disabled_feature_redirects_to_home(self):
+        self.assertEqual(self.client.get(reverse('dashboard:neuro_ads')).status_code, 200)
+        
+        # A queryset update bypasses save(); the next request must still see it
+        get_user_model().objects.filter(pk=self.user.pk).update(neuro_ads_enabled=False)
+        
+        response = self.client.get(reverse('dashboard:neuro_ads'))
+        self.assertRedirects(response, reverse('dashboard:home'), fetch_redirect_response=False)
+    
+    def test_onboarding_flag_is_read_on_every_request(self):
+        self.assertEqual(self.client.get(reverse('dashboard:home')).status_code, 200)
+        
+        get_user_model().objects.filter(pk=self.user.pk).update(onboarding_completed=False)
+        
+        response = self.client.get(reverse('dashboard:home'))
+        self.assertRedirects(response, reverse('users:onboarding'), fetch_redirect_response=False)
+
+
+class AnalyticsOverviewTests(TestCase):
+    def test_chart_data_is_embedded_with_json_script(self):
+        self.client.force_login(get_user_model().objects.create_user(username='alice', password='secret'))
+        
+        response = self.client.get(reverse('dashboard:analytics'))
+        
+        self.assertContains(response, '<script id="analytics-data" type="application/json">')
+        self.assertEqual(
+            response.context['analytics_data']['channel_performance'][0]['channel'],
+            'Google Ads'
+        )
+
+
+class DashboardDataJsonTests(TestCase):
+    def setUp(self):
+        cache.clear()
+    
+    def test_cached_payload_is_not_shared_between_users(self):
+        User = get_user_model()
+        alice = User.objects.create_user(username='alice', password='secret')
+        bob = User.objects.create_user(username='bob', password='secret', neuro_ads_enabled=False)
+        
+        self.client.force_login(alice)
+        self.assertTrue(self.client.get(reverse('dashboard:data')).json()['features']['neuro_ads_enabled'])
+        
+        self.client.force_login(bob)
+        self.assertFalse(self.client.get(reverse('dashboard:data')).json()['features']['neuro_ads_enabled'])
+
+
+class ORJsonResponseTests(SimpleTestCase):
+    data = {
+        'campaigns': ({'id': 1, 'ctr': 2.7},),
+        'generated_at': datetime(2024, 3, 1, 12, 30, tzinfo=timezone.utc),
+    }
+    expected = {'campaigns': [{'id': 1, 'ctr': 2.7}], 'generated_at': '2024-03-01T12:30:00Z'}
+    
+    def test_orjson_path(self):
+        if responses.orjson is None:
+            self.skipTest('orjson is not installed')
+        
+        response = ORJsonResponse(self.data)
+        
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content), self.expected)
+    
+    def test_stdlib_fallback_without_orjson(self):
+        with mock.patch.object(responses, 'orjson', None):
+            response = ORJsonResponse(self.data)
+        
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content), self.expected)
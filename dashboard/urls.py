@@ -10,4 +10,5 @@ urlpatterns = [
     path('email-cortex/', views.email_cortex_dashboard, name='email_cortex'),
     path('analytics/', views.analytics_overview, name='analytics'),
     path('settings/', views.dashboard_settings, name='settings'),
+    path('data/', views.dashboard_data_json, name='data'),
 ]
\ No newline at end of file
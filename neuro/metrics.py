@@ -0,0 +1,12 @@
+"""
+Shared numeric helpers for performance metric calculations
+"""
+
+import numpy as np
+
+
+def safe_ratio(numerator: np.ndarray, denominator: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """Element-wise numerator / denominator * scale, 0 where the denominator is 0"""
+    result = np.zeros_like(numerator)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result * scale
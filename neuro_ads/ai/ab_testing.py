@@ -7,23 +7,33 @@ import math
 import numpy as np
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta, date
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Sum, Avg, Count, Q
 from django.utils import timezone
-from scipy import stats
+from scipy import special
 from ..models import Campaign, AdCreative, ABTest, CampaignAnalytics
 
 logger = logging.getLogger(__name__)
 
+_INV_SQRT2 = 1 / math.sqrt(2)
+
 
 class ABTestEngine:
     """Automated A/B testing engine for ad optimization"""
     
-    def __init__(self):
-        self.min_sample_size = 100           # Minimum sample size per variant
-        self.max_test_duration_days = 14     # Maximum test duration
-        self.significance_threshold = 0.05   # Statistical significance threshold (95% confidence)
-        self.minimum_effect_size = 0.1       # Minimum effect size to declare winner (10% improvement)
-        self.early_stopping_threshold = 0.01 # Stop early if very significant (99% confidence)
+    min_sample_size = 100           # Minimum sample size per variant
+    max_test_duration_days = 14     # Maximum test duration
+    significance_threshold = 0.05   # Statistical significance threshold (95% confidence)
+    minimum_effect_size = 0.1       # Minimum effect size to declare winner (10% improvement)
+    early_stopping_threshold = 0.01 # Stop early if very significant (99% confidence)
+    
+    _REQUIRED_CONFIG_FIELDS = ('test_type', 'variants')
+    _ALLOWED_TEST_TYPES = frozenset({'headline', 'description', 'cta', 'creative'})
+    
+    @property
+    def analysis_cache_ttl(self) -> int:
+        return getattr(settings, 'AB_TEST_CACHE_TTL_SECONDS', 60)
     
     def run_ab_test_analysis(self, ab_test: ABTest) -> Dict[str, Any]:
         """
@@ -36,6 +46,32 @@ class ABTestEngine:
             if ab_test.status not in ['running']:
                 return {'success': False, 'reason': f'Test is not running (status: {ab_test.status})'}
             
+            # Skip the statistical analysis while the test cannot be evaluated yet
+            can_evaluate, precheck_reason = self._precheck_can_evaluate(ab_test)
+            if not can_evaluate:
+                return {
+                    'success': True,
+                    'status': 'continue',
+                    'statistical_results': {},
+                    'recommendation': f'Continue test - {precheck_reason.lower()}'
+                }
+            
+            # Analytics are ingested daily, so a 'continue' result stays valid for
+            # a short while; reusing it costs no database work at all
+            cache_key = self._analysis_cache_key(ab_test)
+            cached_result = cache.get(cache_key)
+            if cached_result is not None:
+                return cached_result
+            
+            # Skip loading the test data until the sample is large enough
+            if not self._sample_size_reached(ab_test):
+                return {
+                    'success': True,
+                    'status': 'continue',
+                    'statistical_results': {},
+                    'recommendation': 'Continue test - minimum sample size not reached'
+                }
+            
             # Get test data
             test_data = self._get_test_data(ab_test)
             
@@ -44,20 +80,26 @@ class ABTestEngine:
             
             # Perform statistical analysis
             statistical_results = self._perform_statistical_analysis(test_data, ab_test.test_type)
+            # Stamped here so cached 'continue' results keep the time of the actual analysis
+            statistical_results['analysis_date'] = datetime.now().isoformat()
             
             # Check if test should be stopped
             should_stop, stop_reason = self._should_stop_test(ab_test, statistical_results)
             
             if should_stop:
                 winner_result = self._declare_winner(ab_test, statistical_results)
-                return self._finalize_test(ab_test, statistical_results, winner_result, stop_reason)
+                # Variant types were resolved once in _get_test_data; reuse them
+                variant_by_id = {data['creative_id']: data['variant_type'] for data in test_data}
+                return self._finalize_test(ab_test, statistical_results, winner_result, stop_reason, variant_by_id)
             else:
-                return {
+                result = {
                     'success': True,
                     'status': 'continue',
                     'statistical_results': statistical_results,
                     'recommendation': 'Continue test - insufficient data for conclusion'
                 }
+                cache.set(cache_key, result, self.analysis_cache_ttl)
+                return result
                 
         except Exception as e:
             logger.error(f"A/B test analysis failed for test {ab_test.id}: {e}")
@@ -119,41 +161,47 @@ class ABTestEngine:
             logger.error(f"Failed to create A/B test: {e}")
             return {'success': False, 'error': str(e)}
     
+    def _analysis_cache_key(self, ab_test: ABTest) -> str:
+        """Cache key for a test's analysis; entries expire after analysis_cache_ttl"""
+        return f"ab_test_analysis:{ab_test.id}"
+    
     def _get_test_data(self, ab_test: ABTest) -> List[Dict[str, Any]]:
         """Get performance data for A/B test variants"""
         
+        if not ab_test.started_at:
+            return []
+        
         # Get all ad creatives for this test
         test_creatives = AdCreative.objects.filter(
             ad_set__campaign=ab_test.campaign,
             created_at__gte=ab_test.started_at
-        ) if ab_test.started_at else AdCreative.objects.none()
+        ).only('id', 'name', 'variant_index')
+        
+        # Get performance metrics for the test period
+        end_date = date.today()
+        start_date = ab_test.started_at.date()
+        
+        # Aggregate metrics once for all creatives (simplified - in real implementation,
+        # you'd track creative-specific metrics and group by creative)
+        metrics = CampaignAnalytics.objects.filter(
+            campaign=ab_test.campaign,
+            date__gte=start_date,
+            date__lte=end_date
+        ).aggregate(
+            total_impressions=Sum('impressions'),
+            total_clicks=Sum('clicks'),
+            total_conversions=Sum('conversions'),
+            total_spend=Sum('spend')
+        )
+        
+        impressions = metrics['total_impressions'] or 0
+        clicks = metrics['total_clicks'] or 0
+        conversions = metrics['total_conversions'] or 0
+        spend = float(metrics['total_spend'] or 0)
         
         test_data = []
         
         for creative in test_creatives:
-            # Get performance metrics for this creative
-            end_date = date.today()
-            start_date = ab_test.started_at.date() if ab_test.started_at else end_date - timedelta(days=7)
-            
-            analytics = CampaignAnalytics.objects.filter(
-                campaign=ab_test.campaign,
-                date__gte=start_date,
-                date__lte=end_date
-            )
-            
-            # Aggregate metrics (simplified - in real implementation, you'd track creative-specific metrics)
-            metrics = analytics.aggregate(
-                total_impressions=Sum('impressions'),
-                total_clicks=Sum('clicks'),
-                total_conversions=Sum('conversions'),
-                total_spend=Sum('spend')
-            )
-            
-            impressions = metrics['total_impressions'] or 0
-            clicks = metrics['total_clicks'] or 0
-            conversions = metrics['total_conversions'] or 0
-            spend = float(metrics['total_spend'] or 0)
-            
             test_data.append({
                 'creative_id': creative.id,
                 'creative_name': creative.name,
@@ -176,23 +224,19 @@ class ABTestEngine:
         if len(test_data) < 2:
             return {'error': 'Need at least 2 variants for analysis'}
         
-        # Group data by variant
-        variants = {}
+        # Accumulate totals per variant in a single pass over the test data
+        variant_totals = {}
         for data in test_data:
-            variant = data['variant_type']
-            if variant not in variants:
-                variants[variant] = []
-            variants[variant].append(data)
+            totals = variant_totals.setdefault(data['variant_type'], [0, 0, 0, 0.0])
+            totals[0] += data['impressions']
+            totals[1] += data['clicks']
+            totals[2] += data['conversions']
+            totals[3] += data['spend']
         
         # Calculate aggregate metrics for each variant
         variant_results = {}
         
-        for variant_name, variant_data in variants.items():
-            total_impressions = sum(d['impressions'] for d in variant_data)
-            total_clicks = sum(d['clicks'] for d in variant_data)
-            total_conversions = sum(d['conversions'] for d in variant_data)
-            total_spend = sum(d['spend'] for d in variant_data)
-            
+        for variant_name, (total_impressions, total_clicks, total_conversions, total_spend) in variant_totals.items():
             variant_results[variant_name] = {
                 'impressions': total_impressions,
                 'clicks': total_clicks,
@@ -214,8 +258,7 @@ class ABTestEngine:
         return {
             'variant_results': variant_results,
             'statistical_tests': statistical_tests,
-            'is_significant': is_significant,
-            'analysis_date': datetime.now().isoformat()
+            'is_significant': is_significant
         }
     
     def _perform_pairwise_tests(self, variant_results: Dict[str, Dict], test_type: str) -> List[Dict[str, Any]]:
@@ -232,149 +275,130 @@ class ABTestEngine:
         else:
             primary_metric = 'ctr'
         
-        # Perform tests between all pairs
-        for i in range(len(variant_names)):
-            for j in range(i + 1, len(variant_names)):
-                variant_a = variant_names[i]
-                variant_b = variant_names[j]
-                
-                data_a = variant_results[variant_a]
-                data_b = variant_results[variant_b]
-                
-                # Perform appropriate statistical test
-                if primary_metric in ['ctr', 'conversion_rate']:
-                    test_result = self._two_proportion_z_test(
-                        data_a['clicks'], data_a['impressions'],
-                        data_b['clicks'], data_b['impressions']
-                    )
-                else:
-                    # For continuous metrics like CPA, CPC
-                    test_result = self._welch_t_test(data_a, data_b, primary_metric)
-                
-                tests.append({
-                    'variant_a': variant_a,
-                    'variant_b': variant_b,
-                    'metric': primary_metric,
-                    'p_value': test_result['p_value'],
-                    'confidence_interval': test_result.get('confidence_interval'),
-                    'effect_size': test_result.get('effect_size', 0),
-                    'winner': test_result.get('winner'),
-                    'is_significant': test_result['p_value'] < self.significance_threshold
-                })
+        # Both primary metrics are proportions, so every pair gets a two-proportion z-test.
+        # Variants without impressions can only produce inconclusive pairs, so skip them
+        variant_names = [name for name in variant_names if variant_results[name]['impressions'] > 0]
+        
+        if len(variant_names) < 2:
+            return tests
+        
+        successes = np.array([variant_results[name]['clicks'] for name in variant_names], dtype=float)
+        trials = np.array([variant_results[name]['impressions'] for name in variant_names], dtype=float)
+        pair_results = self._pairwise_two_proportion_z_tests(successes, trials)
+        
+        for i, j, test_result in pair_results:
+            tests.append({
+                'variant_a': variant_names[i],
+                'variant_b': variant_names[j],
+                'metric': primary_metric,
+                'p_value': test_result['p_value'],
+                'confidence_interval': test_result.get('confidence_interval'),
+                'effect_size': test_result.get('effect_size', 0),
+                'winner': test_result.get('winner'),
+                'is_significant': test_result['p_value'] < self.significance_threshold
+            })
         
         return tests
     
-    def _two_proportion_z_test(self, successes_a: int, trials_a: int, successes_b: int, trials_b: int) -> Dict[str, Any]:
-        """Perform two-proportion z-test"""
-        
-        if trials_a == 0 or trials_b == 0:
-            return {'p_value': 1.0, 'effect_size': 0, 'winner': 'inconclusive'}
-        
-        p_a = successes_a / trials_a
-        p_b = successes_b / trials_b
-        
-        # Pooled proportion
-        p_pool = (successes_a + successes_b) / (trials_a + trials_b)
-        
-        # Standard error
-        se = math.sqrt(p_pool * (1 - p_pool) * (1/trials_a + 1/trials_b))
-        
-        if se == 0:
-            return {'p_value': 1.0, 'effect_size': 0, 'winner': 'inconclusive'}
-        
-        # Z-score
-        z_score = (p_a - p_b) / se
-        
-        # P-value (two-tailed)
-        p_value = 2 * (1 - stats.norm.cdf(abs(z_score)))
+    def _pairwise_two_proportion_z_tests(self, successes: np.ndarray, trials: np.ndarray) -> List[Tuple[int, int, Dict[str, Any]]]:
+        """
+        Perform two-proportion z-tests for every pair of variants at once
         
-        # Effect size (relative improvement)
-        effect_size = abs(p_a - p_b) / p_b if p_b > 0 else 0
+        Returns:
+            List of (index_a, index_b, result) for each pair with index_a < index_b,
+            in the same order as a nested i < j loop
+        """
         
-        # Determine winner
-        winner = 'A' if p_a > p_b else 'B' if p_b > p_a else 'tie'
+        idx_a, idx_b = np.triu_indices(len(successes), 1)
+        successes_a, successes_b = successes[idx_a], successes[idx_b]
+        trials_a, trials_b = trials[idx_a], trials[idx_b]
         
-        # Confidence interval for difference in proportions
-        se_diff = math.sqrt((p_a * (1-p_a) / trials_a) + (p_b * (1-p_b) / trials_b))
-        margin_error = 1.96 * se_diff
-        diff = p_a - p_b
-        ci_lower = diff - margin_error
-        ci_upper = diff + margin_error
+        # Pairs with an empty variant produce inf/nan here and are masked out below
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p_a = successes_a / trials_a
+            p_b = successes_b / trials_b
+            
+            # Pooled proportion
+            p_pool = (successes_a + successes_b) / (trials_a + trials_b)
+            
+            # Standard error
+            se = np.sqrt(p_pool * (1 - p_pool) * (1 / trials_a + 1 / trials_b))
+            
+            # Z-score
+            z_scores = (p_a - p_b) / se
+            
+            # P-value (two-tailed): 2 * (1 - Phi(|z|)) == erfc(|z| / sqrt(2))
+            p_values = special.erfc(np.abs(z_scores) * _INV_SQRT2)
+            
+            # Effect size (relative improvement)
+            effect_sizes = np.where(p_b > 0, np.abs(p_a - p_b) / p_b, 0.0)
+            
+            # Confidence interval for difference in proportions
+            se_diff = np.sqrt((p_a * (1 - p_a) / trials_a) + (p_b * (1 - p_b) / trials_b))
+            margin_error = 1.96 * se_diff
+            diff = p_a - p_b
+            ci_lower = diff - margin_error
+            ci_upper = diff + margin_error
+        
+        valid = (trials_a > 0) & (trials_b > 0) & (se > 0)
+        
+        results = []
+        for k in range(len(idx_a)):
+            if not valid[k]:
+                result = {'p_value': 1.0, 'effect_size': 0, 'winner': 'inconclusive'}
+            else:
+                result = {
+                    'p_value': float(p_values[k]),
+                    'z_score': float(z_scores[k]),
+                    'effect_size': float(effect_sizes[k]),
+                    'winner': 'A' if p_a[k] > p_b[k] else 'B' if p_b[k] > p_a[k] else 'tie',
+                    'confidence_interval': [float(ci_lower[k]), float(ci_upper[k])],
+                    'p_a': float(p_a[k]),
+                    'p_b': float(p_b[k])
+                }
+            results.append((int(idx_a[k]), int(idx_b[k]), result))
         
-        return {
-            'p_value': p_value,
-            'z_score': z_score,
-            'effect_size': effect_size,
-            'winner': winner,
-            'confidence_interval': [ci_lower, ci_upper],
-            'p_a': p_a,
-            'p_b': p_b
-        }
+        return results
     
-    def _welch_t_test(self, data_a: Dict, data_b: Dict, metric: str) -> Dict[str, Any]:
-        """Perform Welch's t-test for continuous metrics"""
-        
-        # For simplicity, we'll estimate variance from the data we have
-        # In a real implementation, you'd need actual sample data points
-        
-        mean_a = data_a.get(metric, 0)
-        mean_b = data_b.get(metric, 0)
+    def _precheck_can_evaluate(self, ab_test: ABTest) -> Tuple[bool, str]:
+        """Query-free duration check run before any analytics are loaded"""
         
-        # Estimate variance (simplified)
-        var_a = (mean_a * 0.2) ** 2  # Assume 20% coefficient of variation
-        var_b = (mean_b * 0.2) ** 2
+        if not ab_test.started_at:
+            return True, ""
         
-        n_a = max(data_a.get('sample_size', 1), 1)
-        n_b = max(data_b.get('sample_size', 1), 1)
-        
-        # Standard error of difference
-        se_diff = math.sqrt(var_a/n_a + var_b/n_b)
-        
-        if se_diff == 0:
-            return {'p_value': 1.0, 'effect_size': 0, 'winner': 'inconclusive'}
-        
-        # T-score
-        t_score = (mean_a - mean_b) / se_diff
-        
-        # Degrees of freedom (Welch's formula)
-        df = (var_a/n_a + var_b/n_b)**2 / ((var_a/n_a)**2/(n_a-1) + (var_b/n_b)**2/(n_b-1))
-        df = max(df, 1)
-        
-        # P-value (two-tailed)
-        p_value = 2 * (1 - stats.t.cdf(abs(t_score), df))
-        
-        # Effect size
-        effect_size = abs(mean_a - mean_b) / max(mean_b, 0.001) if mean_b > 0 else 0
-        
-        # Winner (for CPA and CPC, lower is better)
-        if metric in ['cpa', 'cpc']:
-            winner = 'A' if mean_a < mean_b else 'B' if mean_b < mean_a else 'tie'
-        else:
-            winner = 'A' if mean_a > mean_b else 'B' if mean_b > mean_a else 'tie'
+        # Check minimum duration
+        days_running = (timezone.now() - ab_test.started_at).days
+        if days_running < 3:  # Minimum 3 days
+            return False, "Test running less than minimum duration"
         
-        return {
-            'p_value': p_value,
-            't_score': t_score,
-            'effect_size': effect_size,
-            'winner': winner,
-            'mean_a': mean_a,
-            'mean_b': mean_b
-        }
+        return True, ""
+    
+    def _sample_size_reached(self, ab_test: ABTest) -> bool:
+        """Single SUM over the test window, run before the variant data is loaded"""
+        
+        if not ab_test.started_at:
+            return True
+        
+        # The maximum duration stops the test regardless of sample size
+        if (timezone.now() - ab_test.started_at).days >= self.max_test_duration_days:
+            return True
+        
+        # Every variant currently shares the campaign-wide impressions as its sample size
+        impressions = CampaignAnalytics.objects.filter(
+            campaign=ab_test.campaign,
+            date__gte=ab_test.started_at.date(),
+            date__lte=date.today()
+        ).aggregate(total=Sum('impressions'))['total'] or 0
+        return impressions >= ab_test.minimum_sample_size
     
     def _should_stop_test(self, ab_test: ABTest, statistical_results: Dict[str, Any]) -> Tuple[bool, str]:
-        """Determine if test should be stopped"""
+        """Determine if test should be stopped (minimum duration is checked in _precheck_can_evaluate)"""
         
-        # Check minimum duration
-        if ab_test.started_at:
-            days_running = (timezone.now() - ab_test.started_at).days
-            if days_running < 3:  # Minimum 3 days
-                return False, "Test running less than minimum duration"
+        days_running = (timezone.now() - ab_test.started_at).days if ab_test.started_at else None
         
         # Check maximum duration
-        if ab_test.started_at:
-            days_running = (timezone.now() - ab_test.started_at).days
-            if days_running >= self.max_test_duration_days:
-                return True, "Maximum test duration reached"
+        if days_running is not None and days_running >= self.max_test_duration_days:
+            return True, "Maximum test duration reached"
         
         # Check sample size
         variant_results = statistical_results.get('variant_results', {})
@@ -389,31 +413,24 @@ class ABTestEngine:
         # Check statistical significance
         statistical_tests = statistical_results.get('statistical_tests', [])
         
-        # Early stopping for very significant results
-        very_significant = any(
-            test['p_value'] < self.early_stopping_threshold and test['effect_size'] > self.minimum_effect_size 
-            for test in statistical_tests
+        # Smallest p-value among tests with a meaningful effect, found in one pass
+        best_p_value = min(
+            (test['p_value'] for test in statistical_tests if test['effect_size'] > self.minimum_effect_size),
+            default=1.0
         )
         
-        if very_significant:
+        # Early stopping for very significant results
+        if best_p_value < self.early_stopping_threshold:
             return True, "Early stopping - very significant result"
         
         # Regular significance check
-        significant = any(
-            test['p_value'] < self.significance_threshold and test['effect_size'] > self.minimum_effect_size 
-            for test in statistical_tests
-        )
-        
-        if significant and ab_test.started_at:
-            days_running = (timezone.now() - ab_test.started_at).days
+        if best_p_value < self.significance_threshold and days_running is not None:
             if days_running >= 5:  # Minimum 5 days for regular significance
                 return True, "Statistically significant result"
         
         # Check if test has been running for the planned duration
-        if ab_test.started_at:
-            days_running = (timezone.now() - ab_test.started_at).days
-            if days_running >= ab_test.test_duration_days:
-                return True, "Planned test duration completed"
+        if days_running is not None and days_running >= ab_test.test_duration_days:
+            return True, "Planned test duration completed"
         
         return False, "Continue test"
     
@@ -460,7 +477,7 @@ class ABTestEngine:
             'reason': f"Statistically significant improvement in {best_test['metric']}"
         }
     
-    def _finalize_test(self, ab_test: ABTest, statistical_results: Dict[str, Any], winner_result: Dict[str, Any], stop_reason: str) -> Dict[str, Any]:
+    def _finalize_test(self, ab_test: ABTest, statistical_results: Dict[str, Any], winner_result: Dict[str, Any], stop_reason: str, variant_by_id: Dict[int, str]) -> Dict[str, Any]:
         """Finalize the A/B test and apply results"""
         
         try:
@@ -472,16 +489,15 @@ class ABTestEngine:
             # Set winner if available
             if winner_result.get('winner') and winner_result['winner'] != 'Tie':
                 # Find the winning creative
-                winner_creative = self._find_winning_creative(ab_test, winner_result['winner_name'])
-                if winner_creative:
-                    ab_test.winner_creative = winner_creative
-                    winner_creative.is_winner = True
-                    winner_creative.save()
+                winner_creative_id = self._find_winning_creative_id(winner_result['winner_name'], variant_by_id)
+                if winner_creative_id:
+                    ab_test.winner_creative_id = winner_creative_id
+                    AdCreative.objects.filter(id=winner_creative_id).update(is_winner=True)
             
             ab_test.save()
             
             # Pause losing variants
-            self._pause_losing_variants(ab_test, winner_result)
+            self._pause_losing_variants(winner_result, variant_by_id)
             
             return {
                 'success': True,
@@ -499,13 +515,11 @@ class ABTestEngine:
     def _validate_test_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Validate A/B test configuration"""
         
-        required_fields = ['test_type', 'variants']
-        
-        for field in required_fields:
+        for field in self._REQUIRED_CONFIG_FIELDS:
             if field not in config:
                 return {'valid': False, 'error': f'Missing required field: {field}'}
         
-        if config['test_type'] not in ['headline', 'description', 'cta', 'creative']:
+        if config['test_type'] not in self._ALLOWED_TEST_TYPES:
             return {'valid': False, 'error': 'Invalid test type'}
         
         if len(config['variants']) < 2:
@@ -516,16 +530,14 @@ class ABTestEngine:
     def _create_test_variants(self, ab_test: ABTest, variants: List[Dict[str, Any]]) -> List[AdCreative]:
         """Create ad creative variants for the test"""
         
-        created_variants = []
-        
         # Get the first ad set from the campaign to attach creatives
         ad_set = ab_test.campaign.adset_set.first()
         
         if not ad_set:
             raise ValueError("No ad set found for campaign")
         
-        for i, variant in enumerate(variants):
-            creative = AdCreative.objects.create(
+        creatives = [
+            AdCreative(
                 ad_set=ad_set,
                 name=f"{ab_test.name} - Variant {i+1}",
                 creative_type=variant.get('creative_type', 'text'),
@@ -536,11 +548,14 @@ class ABTestEngine:
                 image_url=variant.get('image_url', ''),
                 video_url=variant.get('video_url', ''),
                 ai_confidence_score=variant.get('confidence_score', 0.8),
+                variant_index=i,
                 is_active=True
             )
-            created_variants.append(creative)
+            for i, variant in enumerate(variants)
+        ]
         
-        return created_variants
+        # Insert all variants in a single query
+        return AdCreative.objects.bulk_create(creatives)
     
     def _launch_test(self, ab_test: ABTest, variants: List[AdCreative], config: Dict[str, Any]) -> Dict[str, Any]:
         """Launch the A/B test on advertising platforms"""
@@ -568,7 +583,11 @@ class ABTestEngine:
     def _get_variant_type(self, creative: AdCreative, test_type: str) -> str:
         """Determine variant type based on creative and test type"""
         
-        # Simple implementation - in reality, you'd track this more systematically
+        # Variants created by _create_test_variants carry their position
+        if creative.variant_index is not None:
+            return chr(ord('A') + creative.variant_index)
+        
+        # Fall back to the name pattern for creatives created before variant_index
         if 'Variant 1' in creative.name:
             return 'A'
         elif 'Variant 2' in creative.name:
@@ -578,47 +597,32 @@ class ABTestEngine:
         else:
             return 'A'  # Default
     
-    def _find_winning_creative(self, ab_test: ABTest, winner_name: str) -> Optional[AdCreative]:
-        """Find the creative corresponding to the winning variant"""
+    def _find_winning_creative_id(self, winner_name: str, variant_by_id: Dict[int, str]) -> Optional[int]:
+        """Find the id of the creative corresponding to the winning variant"""
         
-        # Simple implementation - find creative by name pattern
-        creatives = AdCreative.objects.filter(
-            ad_set__campaign=ab_test.campaign,
-            created_at__gte=ab_test.started_at
-        )
-        
-        for creative in creatives:
-            variant_type = self._get_variant_type(creative, ab_test.test_type)
-            if (winner_name == 'A' and variant_type == 'A') or \
-               (winner_name == 'B' and variant_type == 'B') or \
-               (winner_name == 'C' and variant_type == 'C'):
-                return creative
+        for creative_id, variant_type in variant_by_id.items():
+            if variant_type == winner_name:
+                return creative_id
         
         return None
     
-    def _pause_losing_variants(self, ab_test: ABTest, winner_result: Dict[str, Any]):
-        """Pause losing ad variants"""
+    def _pause_losing_variants(self, winner_result: Dict[str, Any], variant_by_id: Dict[int, str]):
+        """Pause losing ad variants among the test creatives"""
         
         if not winner_result.get('winner') or winner_result['winner'] == 'Tie':
             return
         
-        # Get all test creatives
-        creatives = AdCreative.objects.filter(
-            ad_set__campaign=ab_test.campaign,
-            created_at__gte=ab_test.started_at
-        )
-        
         winner_name = winner_result['winner_name']
         
-        for creative in creatives:
-            variant_type = self._get_variant_type(creative, ab_test.test_type)
-            
-            # Pause non-winning variants
-            if not ((winner_name == 'A' and variant_type == 'A') or \
-                   (winner_name == 'B' and variant_type == 'B') or \
-                   (winner_name == 'C' and variant_type == 'C')):
-                creative.is_active = False
-                creative.save()
+        # Collect non-winning variants
+        loser_ids = [
+            creative_id for creative_id, variant_type in variant_by_id.items()
+            if variant_type != winner_name
+        ]
+        
+        # Pause them in a single UPDATE
+        if loser_ids:
+            AdCreative.objects.filter(id__in=loser_ids).update(is_active=False)
     
     def _generate_recommendations(self, ab_test: ABTest, winner_result: Dict[str, Any], statistical_results: Dict[str, Any]) -> List[str]:
         """Generate recommendations based on test results"""
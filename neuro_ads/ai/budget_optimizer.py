@@ -6,8 +6,11 @@ import logging
 import numpy as np
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta, date
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Sum, Avg, Q
 from django.utils import timezone
+from neuro.metrics import safe_ratio
 from ..models import Campaign, AdSet, CampaignAnalytics, BudgetOptimization
 
 logger = logging.getLogger(__name__)
@@ -16,11 +19,14 @@ logger = logging.getLogger(__name__)
 class BudgetOptimizer:
     """AI-powered budget optimization engine"""
     
-    def __init__(self):
-        self.min_budget_change_threshold = 0.05  # 5% minimum change
-        self.max_budget_change_per_day = 0.20    # 20% maximum change per day
-        self.performance_lookback_days = 7        # Days to analyze for performance
-        self.confidence_threshold = 0.7          # Minimum confidence for changes
+    min_budget_change_threshold = 0.05  # 5% minimum change
+    max_budget_change_per_day = 0.20    # 20% maximum change per day
+    performance_lookback_days = 7       # Days to analyze for performance
+    confidence_threshold = 0.7          # Minimum confidence for changes
+    
+    @property
+    def analytics_cache_ttl(self) -> int:
+        return getattr(settings, 'BUDGET_OPTIMIZER_CACHE_TTL_SECONDS', 300)
     
     def optimize_campaign_budgets(self, campaign: Campaign) -> Dict[str, Any]:
         """
@@ -30,105 +36,127 @@ class BudgetOptimizer:
             Dict with optimization results and new budget allocations
         """
         try:
+            # Load the ad sets once; every step below works on these instances
+            ad_sets = list(campaign.adset_set.select_related('platform'))
+            
+            # Budget can only be shifted between ad sets, so skip the analytics entirely
+            if len(ad_sets) < 2:
+                return {'success': False, 'reason': 'Need at least 2 ad sets for budget optimization'}
+            
+            end_date = date.today()
+            start_date = end_date - timedelta(days=self.performance_lookback_days)
+            
             # Get current performance data
-            performance_data = self._get_performance_data(campaign)
+            totals_by_ad_set = self._get_analytics_totals(campaign, start_date, end_date)
+            tracked_ad_sets, performance_data = self._get_performance_data(ad_sets, totals_by_ad_set)
             
-            if not performance_data:
+            if not tracked_ad_sets:
                 return {'success': False, 'reason': 'Insufficient performance data'}
             
             # Calculate performance metrics
-            metrics = self._calculate_performance_metrics(performance_data)
+            metrics = self._calculate_performance_metrics(tracked_ad_sets, performance_data)
             
             # Determine optimization opportunities
             opportunities = self._identify_optimization_opportunities(metrics)
             
-            if not opportunities:
+            if not opportunities['increase_budget'] and not opportunities['decrease_budget']:
                 return {'success': False, 'reason': 'No optimization opportunities found'}
             
             # Calculate new budget allocation
             new_allocation = self._calculate_optimal_allocation(campaign, metrics, opportunities)
             
             # Validate and apply budget changes
-            if self._should_apply_changes(campaign, new_allocation):
-                return self._apply_budget_optimization(campaign, new_allocation, opportunities)
+            if self._should_apply_changes(ad_sets, new_allocation):
+                metrics_summary = self._get_current_metrics_summary(totals_by_ad_set, start_date, end_date)
+                return self._apply_budget_optimization(campaign, ad_sets, new_allocation, opportunities, metrics_summary)
             else:
                 return {'success': False, 'reason': 'Budget changes below threshold or too risky'}
                 
         except Exception as e:
-            logger.error(f"Budget optimization failed for campaign {campaign.id}: {e}")
+            logger.error("Budget optimization failed for campaign %s: %s", campaign.id, e)
             return {'success': False, 'error': str(e)}
     
-    def _get_performance_data(self, campaign: Campaign) -> List[Dict[str, Any]]:
-        """Get recent performance data for campaign ad sets"""
-        
-        end_date = date.today()
-        start_date = end_date - timedelta(days=self.performance_lookback_days)
+    def _get_analytics_totals(self, campaign: Campaign, start_date: date, end_date: date) -> Dict[Optional[int], Dict[str, Any]]:
+        """Aggregate the campaign's analytics per ad set in a single GROUP BY query"""
+        
+        # Repeated runs on the same day (scheduled sweep after a manual trigger)
+        # reuse the totals; budgets are not part of them, so applying changes
+        # does not invalidate the entry
+        cache_key = f"budget_optimizer:analytics:{campaign.id}:{start_date.isoformat()}:{end_date.isoformat()}"
+        totals_by_ad_set = cache.get(cache_key)
+        if totals_by_ad_set is not None:
+            return totals_by_ad_set
+        
+        totals_by_ad_set = {
+            row['ad_set_id']: row
+            for row in CampaignAnalytics.objects.filter(
+                campaign=campaign,
+                date__gte=start_date,
+                date__lte=end_date
+            ).order_by().values('ad_set_id').annotate(
+                total_impressions=Sum('impressions'),
+                total_clicks=Sum('clicks'),
+                total_conversions=Sum('conversions'),
+                total_spend=Sum('spend'),
+                total_revenue=Sum('revenue')
+            )
+        }
+        cache.set(cache_key, totals_by_ad_set, self.analytics_cache_ttl)
+        return totals_by_ad_set
+    
+    def _get_performance_data(self, ad_sets: List[AdSet], totals_by_ad_set: Dict[Optional[int], Dict[str, Any]]) -> Tuple[List[AdSet], Dict[str, np.ndarray]]:
+        """
+        Get recent performance data for campaign ad sets
         
-        analytics = CampaignAnalytics.objects.filter(
-            campaign=campaign,
-            date__gte=start_date,
-            date__lte=end_date
-        ).select_related('ad_set')
+        Returns:
+            The ad sets that have analytics, and one float64 column per raw metric
+            with a row for each of those ad sets in the same order
+        """
         
-        performance_data = []
+        rows = [(ad_set, totals_by_ad_set[ad_set.id]) for ad_set in ad_sets if ad_set.id in totals_by_ad_set]
         
-        for ad_set in campaign.adset_set.all():
-            ad_set_analytics = analytics.filter(ad_set=ad_set)
-            
-            if ad_set_analytics.exists():
-                # Aggregate metrics for this ad set
-                totals = ad_set_analytics.aggregate(
-                    total_impressions=Sum('impressions'),
-                    total_clicks=Sum('clicks'),
-                    total_conversions=Sum('conversions'),
-                    total_spend=Sum('spend'),
-                    total_revenue=Sum('revenue')
-                )
-                
-                # Calculate derived metrics
-                impressions = totals['total_impressions'] or 0
-                clicks = totals['total_clicks'] or 0
-                conversions = totals['total_conversions'] or 0
-                spend = float(totals['total_spend'] or 0)
-                revenue = float(totals['total_revenue'] or 0)
-                
-                ctr = (clicks / impressions * 100) if impressions > 0 else 0
-                cpc = (spend / clicks) if clicks > 0 else 0
-                cpa = (spend / conversions) if conversions > 0 else 0
-                roas = (revenue / spend) if spend > 0 else 0
-                conversion_rate = (conversions / clicks * 100) if clicks > 0 else 0
-                
-                performance_data.append({
-                    'ad_set': ad_set,
-                    'impressions': impressions,
-                    'clicks': clicks,
-                    'conversions': conversions,
-                    'spend': spend,
-                    'revenue': revenue,
-                    'ctr': ctr,
-                    'cpc': cpc,
-                    'cpa': cpa,
-                    'roas': roas,
-                    'conversion_rate': conversion_rate,
-                    'allocated_budget': float(ad_set.allocated_budget),
-                    'platform': ad_set.platform.name
-                })
+        # Convert the Decimal/int aggregates to float64 in a single step; a NULL
+        # sum becomes NaN here and is zeroed below
+        matrix = np.array([
+            (
+                totals['total_impressions'], totals['total_clicks'], totals['total_conversions'],
+                totals['total_spend'], totals['total_revenue'], ad_set.allocated_budget
+            )
+            for ad_set, totals in rows
+        ], dtype=np.float64).reshape(-1, 6)
+        np.nan_to_num(matrix, copy=False)
+        
+        impressions, clicks, conversions, spend, revenue, allocated_budget = matrix.T
+        performance_data = {
+            'impressions': impressions,
+            'clicks': clicks,
+            'conversions': conversions,
+            'spend': spend,
+            'revenue': revenue,
+            'allocated_budget': allocated_budget
+        }
         
-        return performance_data
+        return [ad_set for ad_set, _ in rows], performance_data
     
-    def _calculate_performance_metrics(self, performance_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _calculate_performance_metrics(self, ad_sets: List[AdSet], performance_data: Dict[str, np.ndarray]) -> Dict[str, Any]:
         """Calculate performance metrics and rankings"""
         
-        if not performance_data:
+        if not ad_sets:
             return {}
         
+        impressions = performance_data['impressions']
+        clicks = performance_data['clicks']
+        conversions = performance_data['conversions']
+        spend = performance_data['spend']
+        revenue = performance_data['revenue']
+        
         # Calculate campaign totals
         campaign_totals = {
-            'total_spend': sum(data['spend'] for data in performance_data),
-            'total_revenue': sum(data['revenue'] for data in performance_data),
-            'total_conversions': sum(data['conversions'] for data in performance_data),
-            'total_clicks': sum(data['clicks'] for data in performance_data),
-            'total_impressions': sum(data['impressions'] for data in performance_data)
+            'total_spend': float(spend.sum()),
+            'total_revenue': float(revenue.sum()),
+            'total_conversions': int(conversions.sum()),
+            'total_clicks': int(clicks.sum()),
+            'total_impressions': int(impressions.sum())
         }
         
         # Calculate campaign averages
@@ -140,176 +168,193 @@ class BudgetOptimizer:
             'avg_conversion_rate': campaign_totals['total_conversions'] / campaign_totals['total_clicks'] * 100 if campaign_totals['total_clicks'] > 0 else 0
         }
         
-        # Score each ad set performance
-        for data in performance_data:
-            data['performance_score'] = self._calculate_performance_score(data, campaign_averages)
-            data['efficiency_score'] = self._calculate_efficiency_score(data)
-            data['spend_utilization'] = data['spend'] / data['allocated_budget'] if data['allocated_budget'] > 0 else 0
+        # Per ad set rates
+        columns = dict(performance_data)
+        columns.update({
+            'ctr': safe_ratio(clicks, impressions, 100.0),
+            'cpc': safe_ratio(spend, clicks),
+            'cpa': safe_ratio(spend, conversions),
+            'roas': safe_ratio(revenue, spend),
+            'conversion_rate': safe_ratio(conversions, clicks, 100.0),
+            'spend_utilization': safe_ratio(spend, performance_data['allocated_budget'])
+        })
         
-        # Rank ad sets by performance
-        performance_data.sort(key=lambda x: x['performance_score'], reverse=True)
+        # Score every ad set at once
+        columns['performance_score'] = self._calculate_performance_scores(columns, campaign_averages)
+        columns['efficiency_score'] = self._calculate_efficiency_scores(columns['spend_utilization'], columns['roas'])
+        
+        # Rank ad sets by performance (stable, like list.sort)
+        ranking = np.argsort(-columns['performance_score'], kind='stable')
         
         return {
-            'ad_sets': performance_data,
+            'ad_sets': [ad_sets[i] for i in ranking],
+            'columns': {key: values[ranking] for key, values in columns.items()},
             'campaign_totals': campaign_totals,
             'campaign_averages': campaign_averages
         }
     
-    def _calculate_performance_score(self, ad_set_data: Dict[str, Any], campaign_averages: Dict[str, Any]) -> float:
-        """Calculate a composite performance score for an ad set"""
+    def _calculate_performance_scores(self, rates: Dict[str, np.ndarray], campaign_averages: Dict[str, Any]) -> np.ndarray:
+        """Calculate a composite performance score for every ad set"""
         
-        score = 0.0
+        scores = np.zeros_like(rates['roas'])
         
         # ROAS contribution (40% weight)
         if campaign_averages['avg_roas'] > 0:
-            roas_ratio = ad_set_data['roas'] / campaign_averages['avg_roas']
-            score += min(roas_ratio, 2.0) * 0.4
+            scores += np.minimum(rates['roas'] / campaign_averages['avg_roas'], 2.0) * 0.4
         
         # Conversion rate contribution (25% weight)
         if campaign_averages['avg_conversion_rate'] > 0:
-            conv_rate_ratio = ad_set_data['conversion_rate'] / campaign_averages['avg_conversion_rate']
-            score += min(conv_rate_ratio, 2.0) * 0.25
+            scores += np.minimum(rates['conversion_rate'] / campaign_averages['avg_conversion_rate'], 2.0) * 0.25
         
         # CTR contribution (20% weight)
         if campaign_averages['avg_ctr'] > 0:
-            ctr_ratio = ad_set_data['ctr'] / campaign_averages['avg_ctr']
-            score += min(ctr_ratio, 2.0) * 0.2
+            scores += np.minimum(rates['ctr'] / campaign_averages['avg_ctr'], 2.0) * 0.2
         
-        # CPA efficiency (15% weight) - lower is better
-        if campaign_averages['avg_cpa'] > 0 and ad_set_data['cpa'] > 0:
-            cpa_efficiency = campaign_averages['avg_cpa'] / ad_set_data['cpa']
-            score += min(cpa_efficiency, 2.0) * 0.15
+        # CPA efficiency (15% weight) - lower is better, ad sets without conversions score 0
+        if campaign_averages['avg_cpa'] > 0:
+            cpa_efficiency = safe_ratio(np.full_like(rates['cpa'], campaign_averages['avg_cpa']), rates['cpa'])
+            scores += np.minimum(cpa_efficiency, 2.0) * 0.15
         
-        return score
+        return scores
     
-    def _calculate_efficiency_score(self, ad_set_data: Dict[str, Any]) -> float:
-        """Calculate efficiency score based on spend utilization and performance"""
-        
-        utilization = ad_set_data['spend_utilization']
-        roas = ad_set_data['roas']
+    def _calculate_efficiency_scores(self, utilization: np.ndarray, roas: np.ndarray) -> np.ndarray:
+        """Calculate efficiency scores based on spend utilization and performance"""
         
         # Ideal utilization is between 80-95%
-        if 0.8 <= utilization <= 0.95:
-            utilization_score = 1.0
-        elif utilization < 0.8:
-            utilization_score = utilization / 0.8
-        else:  # utilization > 0.95
-            utilization_score = max(0.5, 1.0 - (utilization - 0.95) * 2)
+        utilization_scores = np.select(
+            [utilization < 0.8, utilization <= 0.95],
+            [utilization / 0.8, 1.0],
+            default=np.maximum(0.5, 1.0 - (utilization - 0.95) * 2)
+        )
         
         # ROAS score (normalized)
-        roas_score = min(roas / 3.0, 1.0) if roas > 0 else 0
+        roas_scores = np.minimum(roas / 3.0, 1.0)
         
-        return (utilization_score * 0.6) + (roas_score * 0.4)
+        return (utilization_scores * 0.6) + (roas_scores * 0.4)
     
-    def _identify_optimization_opportunities(self, metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Identify budget optimization opportunities"""
+    def _identify_optimization_opportunities(self, metrics: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """Identify budget optimization opportunities, keyed by opportunity type"""
         
-        opportunities = []
+        increases = []
+        decreases = []
         ad_sets = metrics.get('ad_sets', [])
         
         if len(ad_sets) < 2:
-            return opportunities
+            return {'increase_budget': increases, 'decrease_budget': decreases}
+        
+        columns = metrics['columns']
+        scores = columns['performance_score']
+        utilization = columns['spend_utilization']
+        budgets = columns['allocated_budget'].tolist()
         
         # Find high performers that could use more budget
-        high_performers = [ad_set for ad_set in ad_sets if ad_set['performance_score'] > 1.2 and ad_set['spend_utilization'] > 0.8]
+        high_performers = np.flatnonzero((scores > 1.2) & (utilization > 0.8)).tolist()
         
         # Find low performers that should have budget reduced
-        low_performers = [ad_set for ad_set in ad_sets if ad_set['performance_score'] < 0.8]
+        is_low_performer = scores < 0.8
+        low_performers = np.flatnonzero(is_low_performer).tolist()
+        
+        # Find underutilized budget, without double-penalizing low performers
+        underutilized = np.flatnonzero((utilization < 0.6) & ~is_low_performer).tolist()
         
-        # Find underutilized budget
-        underutilized = [ad_set for ad_set in ad_sets if ad_set['spend_utilization'] < 0.6]
+        scores = scores.tolist()
+        utilization = utilization.tolist()
         
-        for high_performer in high_performers:
-            opportunities.append({
+        for i in high_performers:
+            increases.append({
                 'type': 'increase_budget',
-                'ad_set': high_performer['ad_set'],
-                'current_budget': high_performer['allocated_budget'],
-                'reason': f"High performance score ({high_performer['performance_score']:.2f}) with high utilization",
-                'confidence': min(high_performer['performance_score'] / 1.5, 1.0),
-                'suggested_increase': min(0.2, high_performer['performance_score'] - 1.0)
+                'ad_set': ad_sets[i],
+                'index': i,
+                'current_budget': budgets[i],
+                'reason': f"High performance score ({scores[i]:.2f}) with high utilization",
+                'confidence': min(scores[i] / 1.5, 1.0),
+                'suggested_increase': min(0.2, scores[i] - 1.0)
             })
         
-        for low_performer in low_performers:
-            if low_performer['spend_utilization'] > 0.3:  # Only if actually spending
-                opportunities.append({
+        for i in low_performers:
+            if utilization[i] > 0.3:  # Only if actually spending
+                decreases.append({
                     'type': 'decrease_budget',
-                    'ad_set': low_performer['ad_set'],
-                    'current_budget': low_performer['allocated_budget'],
-                    'reason': f"Low performance score ({low_performer['performance_score']:.2f})",
-                    'confidence': min((1.0 - low_performer['performance_score']), 1.0),
-                    'suggested_decrease': min(0.3, 1.0 - low_performer['performance_score'])
+                    'ad_set': ad_sets[i],
+                    'index': i,
+                    'current_budget': budgets[i],
+                    'reason': f"Low performance score ({scores[i]:.2f})",
+                    'confidence': min((1.0 - scores[i]), 1.0),
+                    'suggested_decrease': min(0.3, 1.0 - scores[i])
                 })
         
-        for underutil in underutilized:
-            if underutil not in low_performers:  # Don't double-penalize
-                opportunities.append({
-                    'type': 'decrease_budget',
-                    'ad_set': underutil['ad_set'],
-                    'current_budget': underutil['allocated_budget'],
-                    'reason': f"Low budget utilization ({underutil['spend_utilization']:.1%})",
-                    'confidence': 1.0 - underutil['spend_utilization'],
-                    'suggested_decrease': min(0.4, 1.0 - underutil['spend_utilization'])
-                })
+        for i in underutilized:
+            decreases.append({
+                'type': 'decrease_budget',
+                'ad_set': ad_sets[i],
+                'index': i,
+                'current_budget': budgets[i],
+                'reason': f"Low budget utilization ({utilization[i]:.1%})",
+                'confidence': 1.0 - utilization[i],
+                'suggested_decrease': min(0.4, 1.0 - utilization[i])
+            })
         
         # Filter opportunities by confidence threshold
-        opportunities = [opp for opp in opportunities if opp['confidence'] >= self.confidence_threshold]
-        
-        return opportunities
+        return {
+            'increase_budget': [opp for opp in increases if opp['confidence'] >= self.confidence_threshold],
+            'decrease_budget': [opp for opp in decreases if opp['confidence'] >= self.confidence_threshold]
+        }
     
-    def _calculate_optimal_allocation(self, campaign: Campaign, metrics: Dict[str, Any], opportunities: List[Dict[str, Any]]) -> Dict[str, float]:
+    def _calculate_optimal_allocation(self, campaign: Campaign, metrics: Dict[str, Any], opportunities: Dict[str, List[Dict[str, Any]]]) -> Dict[str, float]:
         """Calculate new optimal budget allocation"""
         
         current_total_budget = float(campaign.total_budget)
         ad_sets = metrics['ad_sets']
         
-        # Start with current allocation
-        new_allocation = {ad_set['ad_set'].id: ad_set['allocated_budget'] for ad_set in ad_sets}
+        # Work on a copy of the current allocation, indexed like metrics['ad_sets']
+        budgets = metrics['columns']['allocated_budget'].copy()
         
         # Calculate total budget to redistribute
         budget_to_redistribute = 0.0
         
         # First, calculate decreases
-        for opportunity in opportunities:
-            if opportunity['type'] == 'decrease_budget':
-                ad_set_id = opportunity['ad_set'].id
-                current_budget = new_allocation[ad_set_id]
-                decrease_amount = current_budget * opportunity['suggested_decrease']
-                
-                # Apply limits
-                decrease_amount = min(decrease_amount, current_budget * self.max_budget_change_per_day)
-                
-                new_allocation[ad_set_id] = current_budget - decrease_amount
-                budget_to_redistribute += decrease_amount
+        decrease_opportunities = opportunities['decrease_budget']
+        
+        if decrease_opportunities:
+            indices = np.array([opp['index'] for opp in decrease_opportunities])
+            current_budgets = budgets[indices]
+            decrease_amounts = current_budgets * np.array([opp['suggested_decrease'] for opp in decrease_opportunities])
+            
+            # Apply limits
+            decrease_amounts = np.minimum(decrease_amounts, current_budgets * self.max_budget_change_per_day)
+            
+            budgets[indices] = current_budgets - decrease_amounts
+            budget_to_redistribute = float(decrease_amounts.sum())
         
         # Then, distribute increases proportionally to performance
-        increase_opportunities = [opp for opp in opportunities if opp['type'] == 'increase_budget']
+        increase_opportunities = opportunities['increase_budget']
         
         if increase_opportunities and budget_to_redistribute > 0:
-            total_performance_weight = sum(opp['confidence'] * opp['suggested_increase'] for opp in increase_opportunities)
+            performance_weights = np.array([opp['confidence'] * opp['suggested_increase'] for opp in increase_opportunities])
+            total_performance_weight = performance_weights.sum()
             
-            for opportunity in increase_opportunities:
-                if total_performance_weight > 0:
-                    weight = (opportunity['confidence'] * opportunity['suggested_increase']) / total_performance_weight
-                    increase_amount = budget_to_redistribute * weight
-                    
-                    # Apply limits
-                    ad_set_id = opportunity['ad_set'].id
-                    current_budget = new_allocation[ad_set_id]
-                    max_increase = current_budget * self.max_budget_change_per_day
-                    increase_amount = min(increase_amount, max_increase)
-                    
-                    new_allocation[ad_set_id] = current_budget + increase_amount
+            if total_performance_weight > 0:
+                indices = np.array([opp['index'] for opp in increase_opportunities])
+                current_budgets = budgets[indices]
+                increase_amounts = budget_to_redistribute * (performance_weights / total_performance_weight)
+                
+                # Apply limits
+                increase_amounts = np.minimum(increase_amounts, current_budgets * self.max_budget_change_per_day)
+                
+                budgets[indices] = current_budgets + increase_amounts
+        
+        new_allocation = {ad_set.id: budget for ad_set, budget in zip(ad_sets, budgets.tolist())}
         
         return new_allocation
     
-    def _should_apply_changes(self, campaign: Campaign, new_allocation: Dict[str, float]) -> bool:
+    def _should_apply_changes(self, ad_sets: List[AdSet], new_allocation: Dict[str, float]) -> bool:
         """Determine if budget changes should be applied"""
         
         # Check if changes are significant enough
         total_change = 0.0
         total_budget = 0.0
         
-        for ad_set in campaign.adset_set.all():
+        for ad_set in ad_sets:
             current_budget = float(ad_set.allocated_budget)
             new_budget = new_allocation.get(ad_set.id, current_budget)
             
@@ -324,31 +369,42 @@ class BudgetOptimizer:
         
         return False
     
-    def _apply_budget_optimization(self, campaign: Campaign, new_allocation: Dict[str, float], opportunities: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _apply_budget_optimization(self, campaign: Campaign, ad_sets: List[AdSet], new_allocation: Dict[str, float], opportunities: Dict[str, List[Dict[str, Any]]], metrics_summary: Dict[str, Any]) -> Dict[str, Any]:
         """Apply the budget optimization changes"""
         
         try:
-            # Store previous allocation for history
+            # Store previous and proposed allocation for history, keyed by the
+            # str ids the JSON fields would store anyway
             previous_allocation = {}
+            proposed_allocation = {}
             changes_made = []
+            changed_ad_sets = []
+            now = timezone.now()
             
-            for ad_set in campaign.adset_set.all():
-                previous_allocation[ad_set.id] = float(ad_set.allocated_budget)
-                new_budget = new_allocation.get(ad_set.id, previous_allocation[ad_set.id])
+            for ad_set in ad_sets:
+                previous_budget = float(ad_set.allocated_budget)
+                new_budget = new_allocation.get(ad_set.id, previous_budget)
+                previous_allocation[str(ad_set.id)] = previous_budget
+                proposed_allocation[str(ad_set.id)] = new_budget
                 
-                if abs(new_budget - previous_allocation[ad_set.id]) >= previous_allocation[ad_set.id] * self.min_budget_change_threshold:
+                if abs(new_budget - previous_budget) >= previous_budget * self.min_budget_change_threshold:
                     ad_set.allocated_budget = new_budget
-                    ad_set.save()
+                    ad_set.updated_at = now  # bulk_update bypasses auto_now
+                    changed_ad_sets.append(ad_set)
                     
                     changes_made.append({
                         'ad_set': ad_set.name,
                         'platform': ad_set.platform.name,
-                        'previous_budget': previous_allocation[ad_set.id],
+                        'previous_budget': previous_budget,
                         'new_budget': new_budget,
-                        'change_amount': new_budget - previous_allocation[ad_set.id],
-                        'change_percentage': (new_budget - previous_allocation[ad_set.id]) / previous_allocation[ad_set.id] * 100
+                        'change_amount': new_budget - previous_budget,
+                        'change_percentage': (new_budget - previous_budget) / previous_budget * 100
                     })
             
+            # Write every budget change in a single query
+            if changed_ad_sets:
+                AdSet.objects.bulk_update(changed_ad_sets, ['allocated_budget', 'updated_at'], batch_size=500)
+            
             # Calculate expected improvement
             expected_roas_improvement = self._calculate_expected_improvement(opportunities)
             
@@ -358,9 +414,9 @@ class BudgetOptimizer:
             budget_optimization = BudgetOptimization.objects.create(
                 campaign=campaign,
                 previous_allocation=previous_allocation,
-                new_allocation={ad_set_id: new_allocation.get(ad_set_id, previous_allocation[ad_set_id]) for ad_set_id in previous_allocation},
+                new_allocation=proposed_allocation,
                 optimization_reason=optimization_reason,
-                performance_metrics=self._get_current_metrics_summary(campaign),
+                performance_metrics=metrics_summary,
                 expected_roas_improvement=expected_roas_improvement
             )
             
@@ -370,68 +426,57 @@ class BudgetOptimizer:
                 'changes_made': changes_made,
                 'expected_improvement': expected_roas_improvement,
                 'reason': optimization_reason,
-                'opportunities_count': len(opportunities)
+                'opportunities_count': len(opportunities['increase_budget']) + len(opportunities['decrease_budget'])
             }
             
         except Exception as e:
-            logger.error(f"Failed to apply budget optimization: {e}")
+            logger.error("Failed to apply budget optimization: %s", e)
             return {'success': False, 'error': str(e)}
     
-    def _calculate_expected_improvement(self, opportunities: List[Dict[str, Any]]) -> float:
+    def _calculate_expected_improvement(self, opportunities: Dict[str, List[Dict[str, Any]]]) -> float:
         """Calculate expected ROAS improvement from optimization"""
         
         improvement = 0.0
         
-        for opportunity in opportunities:
-            if opportunity['type'] == 'increase_budget':
-                # Expect positive impact from increasing budget for high performers
-                improvement += opportunity['confidence'] * 0.1  # 10% potential improvement
-            elif opportunity['type'] == 'decrease_budget':
-                # Expect savings from reducing budget for low performers
-                improvement += opportunity['confidence'] * 0.05  # 5% potential improvement
+        # Expect positive impact from increasing budget for high performers
+        for opportunity in opportunities['increase_budget']:
+            improvement += opportunity['confidence'] * 0.1  # 10% potential improvement
+        
+        # Expect savings from reducing budget for low performers
+        for opportunity in opportunities['decrease_budget']:
+            improvement += opportunity['confidence'] * 0.05  # 5% potential improvement
         
         return min(improvement, 0.5)  # Cap at 50% expected improvement
     
-    def _generate_optimization_summary(self, opportunities: List[Dict[str, Any]]) -> str:
+    def _generate_optimization_summary(self, opportunities: Dict[str, List[Dict[str, Any]]]) -> str:
         """Generate a summary of optimization decisions"""
         
-        increases = len([opp for opp in opportunities if opp['type'] == 'increase_budget'])
-        decreases = len([opp for opp in opportunities if opp['type'] == 'decrease_budget'])
+        increases = len(opportunities['increase_budget'])
+        decreases = len(opportunities['decrease_budget'])
         
         summary = f"Budget optimization applied: {increases} budget increases for high-performing ad sets, {decreases} budget decreases for underperforming ad sets."
         
-        if opportunities:
-            avg_confidence = sum(opp['confidence'] for opp in opportunities) / len(opportunities)
+        if increases or decreases:
+            total_confidence = sum(opp['confidence'] for opp in opportunities['increase_budget']) + sum(opp['confidence'] for opp in opportunities['decrease_budget'])
+            avg_confidence = total_confidence / (increases + decreases)
             summary += f" Average confidence: {avg_confidence:.1%}"
         
         return summary
     
-    def _get_current_metrics_summary(self, campaign: Campaign) -> Dict[str, Any]:
-        """Get current performance metrics summary for the campaign"""
+    def _get_current_metrics_summary(self, totals_by_ad_set: Dict[Optional[int], Dict[str, Any]], start_date: date, end_date: date) -> Dict[str, Any]:
+        """Summarize the campaign's performance from the per ad set analytics totals"""
         
-        end_date = date.today()
-        start_date = end_date - timedelta(days=7)
-        
-        analytics = CampaignAnalytics.objects.filter(
-            campaign=campaign,
-            date__gte=start_date,
-            date__lte=end_date
-        )
-        
-        totals = analytics.aggregate(
-            total_spend=Sum('spend'),
-            total_revenue=Sum('revenue'),
-            total_conversions=Sum('conversions'),
-            total_clicks=Sum('clicks'),
-            total_impressions=Sum('impressions')
-        )
+        totals = {
+            key: sum(row[key] or 0 for row in totals_by_ad_set.values())
+            for key in ('total_spend', 'total_revenue', 'total_conversions', 'total_clicks', 'total_impressions')
+        }
         
         return {
             'period': f"{start_date} to {end_date}",
-            'total_spend': float(totals['total_spend'] or 0),
-            'total_revenue': float(totals['total_revenue'] or 0),
-            'total_conversions': totals['total_conversions'] or 0,
-            'total_clicks': totals['total_clicks'] or 0,
-            'total_impressions': totals['total_impressions'] or 0,
-            'roas': float(totals['total_revenue'] or 0) / float(totals['total_spend'] or 1)
-        }
\ No newline at end of file
+            'total_spend': float(totals['total_spend']),
+            'total_revenue': float(totals['total_revenue']),
+            'total_conversions': totals['total_conversions'],
+            'total_clicks': totals['total_clicks'],
+            'total_impressions': totals['total_impressions'],
+            'roas': float(totals['total_revenue']) / float(totals['total_spend'] or 1)
+        }
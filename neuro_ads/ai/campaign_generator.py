@@ -2,12 +2,16 @@
 AI Campaign Generator for autonomous ad campaign creation
 """
 
+import functools
 import logging
 import json
-import random
-from typing import Dict, List, Optional, Any, Tuple
+import operator
+import re
+import numpy as np
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Tuple
 from datetime import datetime, timedelta
-from django.contrib.auth.models import User
+from django.contrib.auth import get_user_model
 from django.db import transaction
 from ..models import Campaign, AdSet, AdCreative, AdPlatform
 from ..services.google_ads import GoogleAdsService
@@ -16,17 +20,302 @@ from ..services.linkedin_ads import LinkedInAdsService
 
 logger = logging.getLogger(__name__)
 
+User = get_user_model()
+
+# Source of the simulated AI confidence scores
+_rng = np.random.default_rng()
+
+# Keyword tables for the brief classifiers, matched as substrings of the
+# lowercased text so stems like 'tech' or 'shop' also hit longer words
+_B2B_KEYWORDS = frozenset({'software', 'saas', 'enterprise', 'business', 'professional', 'consulting'})
+_B2C_KEYWORDS = frozenset({'consumer', 'retail', 'ecommerce', 'shop', 'buy', 'product'})
+_SERVICE_KEYWORDS = frozenset({'service', 'agency', 'consulting', 'professional'})
+_PRODUCT_KEYWORDS = frozenset({'product', 'manufacturing', 'retail', 'ecommerce'})
+
+_INTEREST_KEYWORDS = {
+    'technology': frozenset({'tech', 'software', 'digital', 'innovation'}),
+    'business': frozenset({'business', 'professional', 'entrepreneur', 'startup'}),
+    'lifestyle': frozenset({'lifestyle', 'wellness', 'health', 'fitness'}),
+    'entertainment': frozenset({'entertainment', 'music', 'movies', 'gaming'}),
+    'education': frozenset({'education', 'learning', 'courses', 'training'})
+}
+
+# Platform objectives and KPIs per campaign objective, shared read-only
+_OBJECTIVE_MAPPING = {
+    'awareness': MappingProxyType({
+        'google': 'DISPLAY',
+        'meta': 'BRAND_AWARENESS',
+        'linkedin': 'BRAND_AWARENESS',
+        'primary_kpi': 'impressions',
+        'secondary_kpi': 'reach'
+    }),
+    'traffic': MappingProxyType({
+        'google': 'SEARCH',
+        'meta': 'LINK_CLICKS',
+        'linkedin': 'WEBSITE_VISITS',
+        'primary_kpi': 'clicks',
+        'secondary_kpi': 'ctr'
+    }),
+    'leads': MappingProxyType({
+        'google': 'SEARCH',
+        'meta': 'LEAD_GENERATION',
+        'linkedin': 'LEAD_GENERATION',
+        'primary_kpi': 'conversions',
+        'secondary_kpi': 'cpa'
+    }),
+    'sales': MappingProxyType({
+        'google': 'SHOPPING',
+        'meta': 'CONVERSIONS',
+        'linkedin': 'WEBSITE_CONVERSIONS',
+        'primary_kpi': 'conversions',
+        'secondary_kpi': 'roas'
+    })
+}
+
+# Checked in order; the first objective with a matching keyword wins
+_OBJECTIVE_KEYWORDS = (
+    ('awareness', frozenset({'awareness', 'brand', 'visibility'})),
+    ('traffic', frozenset({'traffic', 'visits', 'website'})),
+    ('leads', frozenset({'leads', 'signup', 'contact'})),
+    ('sales', frozenset({'sales', 'purchase', 'buy', 'revenue'}))
+)
+
+# Per-platform optimization goals, shared read-only
+_OPTIMIZATION_GOALS = {
+    'awareness': MappingProxyType({
+        'google': 'MAXIMIZE_IMPRESSIONS',
+        'meta': 'REACH',
+        'linkedin': 'BRAND_AWARENESS'
+    }),
+    'traffic': MappingProxyType({
+        'google': 'MAXIMIZE_CLICKS',
+        'meta': 'LINK_CLICKS',
+        'linkedin': 'WEBSITE_VISITS'
+    }),
+    'leads': MappingProxyType({
+        'google': 'MAXIMIZE_CONVERSIONS',
+        'meta': 'LEAD_GENERATION',
+        'linkedin': 'LEAD_GENERATION'
+    }),
+    'conversions': MappingProxyType({
+        'google': 'MAXIMIZE_CONVERSION_VALUE',
+        'meta': 'CONVERSIONS',
+        'linkedin': 'WEBSITE_CONVERSIONS'
+    })
+}
+
+# Platform allocation weights based on typical performance
+_PLATFORM_WEIGHTS = {
+    'google': 0.4,  # Generally high intent traffic
+    'meta': 0.35,   # Good for awareness and targeting
+    'linkedin': 0.25  # Best for B2B but more expensive
+}
+
+# Content themes offered for every brief, shared read-only
+_CONTENT_THEMES = (
+    # Problem-solution theme
+    MappingProxyType({
+        'theme': 'problem_solution',
+        'headline_template': "Solve {problem} with {solution}",
+        'description_template': "Discover how {product_service} helps {target_audience} achieve {benefit}",
+        'cta_options': ('Learn More', 'Get Started', 'Try Now')
+    }),
+    # Benefit-focused theme
+    MappingProxyType({
+        'theme': 'benefit_focused',
+        'headline_template': "{benefit} for {target_audience}",
+        'description_template': "Experience {key_benefit} with our {product_service}. Join thousands of satisfied customers.",
+        'cta_options': ('See Benefits', 'Start Today', 'Learn How')
+    }),
+    # Urgency theme
+    MappingProxyType({
+        'theme': 'urgency',
+        'headline_template': "Limited Time: {offer}",
+        'description_template': "Don't miss out! Get {benefit} with {product_service}. Offer expires soon.",
+        'cta_options': ('Act Now', 'Claim Offer', 'Get Started')
+    }),
+    # Trust/social proof theme
+    MappingProxyType({
+        'theme': 'social_proof',
+        'headline_template': "Join {number}+ Happy Customers",
+        'description_template': "See why {number}+ businesses trust {product_service} for {benefit}",
+        'cta_options': ('Join Now', 'See Reviews', 'Get Started')
+    })
+)
+
+# Campaign type per goal keyword group, checked in order
+_GOAL_TYPE_KEYWORDS = (
+    ('awareness', ('awareness', 'brand')),
+    ('traffic', ('traffic', 'visits')),
+    ('engagement', ('engagement',)),
+    ('leads', ('leads', 'signup')),
+    ('sales', ('sales', 'purchase'))
+)
+
+# Ad copy templates per content theme, filled with str.format_map
+_HEADLINE_TEMPLATES = {
+    'problem_solution': (
+        "Solve Your Biggest Challenge with {product_service}",
+        "The Solution {target_audience} Have Been Waiting For",
+        "Transform Your Business with {product_service}"
+    ),
+    'benefit_focused': (
+        "Increase Efficiency with {product_service}",
+        "Save Time and Money with {product_service}",
+        "Get Better Results with {product_service}"
+    ),
+    'urgency': (
+        "Limited Time: Special Offer on {product_service}",
+        "Don't Miss Out - {product_service} Available Now",
+        "Act Fast: Exclusive {product_service} Deal"
+    ),
+    'social_proof': (
+        "Join 10,000+ Happy Customers",
+        "Trusted by Industry Leaders",
+        "The #1 Choice for {target_audience}"
+    )
+}
+
+_DESCRIPTION_TEMPLATES = {
+    'problem_solution': (
+        "Discover how {product_service} solves your biggest challenges and drives real results.",
+        "Stop struggling with inefficient processes. {product_service_title} streamlines everything.",
+        "Get the solution that actually works. Proven results for businesses like yours."
+    ),
+    'benefit_focused': (
+        "Experience the benefits that matter most to your business success.",
+        "Save time, reduce costs, and improve outcomes with {product_service}.",
+        "Get more done in less time with our proven {product_service}."
+    ),
+    'urgency': (
+        "Limited time offer - don't miss your chance to save and improve your results.",
+        "Special pricing available now. Join thousands of satisfied customers today.",
+        "Exclusive offer ends soon. Start transforming your business now."
+    ),
+    'social_proof': (
+        "See why thousands of businesses trust us for their {product_service} needs.",
+        "Join the community of successful businesses that chose {product_service}.",
+        "Proven track record with industry-leading customer satisfaction."
+    )
+}
+
+# Common words left out of extracted keywords
+_STOP_WORDS = frozenset({'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'a', 'an'})
+
+# Whitespace-separated words without leading/trailing sentence punctuation
+_WORD_RE = re.compile(r"[^\s.,!?]+(?:[.,!?]+[^\s.,!?]+)*")
+
+
+def _count_keywords(keywords: frozenset, text: str) -> int:
+    """Number of keywords that occur in the (lowercased) text"""
+    return sum(keyword in text for keyword in keywords)
+
+
+@functools.lru_cache(maxsize=128)
+def _extract_keywords(description: str) -> Tuple[str, ...]:
+    """Top 20 non stop-word keywords of a description, memoized per text"""
+    keywords = [word for word in _WORD_RE.findall(description.lower()) if len(word) > 3 and word not in _STOP_WORDS]
+    return tuple(keywords[:20])
+
+
+@functools.lru_cache(maxsize=1024)
+def _classify_description(description_lower: str) -> Mapping[str, Any]:
+    """Business type classification of a lowercased description, memoized per text"""
+    
+    # Simple keyword-based classification (can be enhanced with ML)
+    b2b_score = _count_keywords(_B2B_KEYWORDS, description_lower)
+    b2c_score = _count_keywords(_B2C_KEYWORDS, description_lower)
+    service_score = _count_keywords(_SERVICE_KEYWORDS, description_lower)
+    product_score = _count_keywords(_PRODUCT_KEYWORDS, description_lower)
+    
+    primary_type = 'B2B' if b2b_score > b2c_score else 'B2C'
+    secondary_type = 'Service' if service_score > product_score else 'Product'
+    
+    return MappingProxyType({
+        'primary': primary_type,
+        'secondary': secondary_type,
+        'confidence': max(b2b_score, b2c_score) / len(description_lower.split()),
+        'characteristics': MappingProxyType({
+            'b2b_indicators': b2b_score,
+            'b2c_indicators': b2c_score,
+            'service_indicators': service_score,
+            'product_indicators': product_score
+        })
+    })
+
+
+@functools.lru_cache(maxsize=1024)
+def _objectives_for_goal(goal_lower: str) -> Mapping[str, str]:
+    """Platform objectives for a lowercased campaign goal, memoized per goal"""
+    
+    # Determine primary objective
+    for objective, keywords in _OBJECTIVE_KEYWORDS:
+        if any(keyword in goal_lower for keyword in keywords):
+            return _OBJECTIVE_MAPPING[objective]
+    
+    return _OBJECTIVE_MAPPING['traffic']  # Default
+
+
+@functools.lru_cache(maxsize=1024)
+def _campaign_type_for_goal(goal: str) -> str:
+    """Campaign type for a campaign goal, memoized per goal"""
+    
+    goal_lower = goal.lower()
+    
+    for campaign_type, keywords in _GOAL_TYPE_KEYWORDS:
+        if any(keyword in goal_lower for keyword in keywords):
+            return campaign_type
+    
+    return 'conversions'
+
+
+def _to_builtin(value: Any) -> Any:
+    """Plain dict/list copy of a structure built from the shared read-only tables"""
+    if isinstance(value, Mapping):
+        return {key: _to_builtin(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(item) for item in value]
+    return value
+
+
+class _PlatformServices(Mapping):
+    """Platform services by name, each created on first access"""
+    
+    _SERVICE_CLASSES = {
+        'google': GoogleAdsService,
+        'meta': MetaAdsService,
+        'linkedin': LinkedInAdsService
+    }
+    
+    def __init__(self, user: User):
+        self._user = user
+        self._services = {}
+    
+    def __getitem__(self, name: str):
+        service = self._services.get(name)
+        if service is None:
+            # Raises KeyError for unsupported platforms, like a plain dict
+            service = self._services[name] = self._SERVICE_CLASSES[name](self._user)
+        return service
+    
+    def __contains__(self, name) -> bool:
+        # Membership checks must not instantiate (and fetch credentials for) a service
+        return name in self._SERVICE_CLASSES
+    
+    def __iter__(self):
+        return iter(self._SERVICE_CLASSES)
+    
+    def __len__(self) -> int:
+        return len(self._SERVICE_CLASSES)
+
 
 class CampaignGenerator:
     """AI-powered campaign generation system"""
     
     def __init__(self, user: User):
         self.user = user
-        self.platforms = {
-            'google': GoogleAdsService(user),
-            'meta': MetaAdsService(user),
-            'linkedin': LinkedInAdsService(user)
-        }
+        # Services are only built for the platforms a brief actually uses
+        self.platforms = _PlatformServices(user)
     
     def generate_autonomous_campaign(
         self, 
@@ -48,36 +337,51 @@ class CampaignGenerator:
             }
         """
         try:
+            # 1. Analyze campaign brief and generate strategy
+            campaign_strategy = self._analyze_campaign_brief(campaign_brief)
+            
+            # 2. Generate AI-optimized content variations
+            content_variations = self._generate_content_variations(campaign_brief, campaign_strategy)
+            
+            # 3. Resolve the platforms to launch on
+            platform_names = [
+                name for name in campaign_brief.get('preferred_platforms', ['google', 'meta', 'linkedin'])
+                if name in self.platforms
+            ]
+            platform_rows = {p.name: p for p in AdPlatform.objects.only('id', 'name').filter(name__in=platform_names)}
+            
+            for platform_name in platform_names:
+                if platform_name not in platform_rows:
+                    raise AdPlatform.DoesNotExist(f"AdPlatform '{platform_name}' does not exist")
+            
+            # Only the writes need a transaction; everything above is computed up front
             with transaction.atomic():
-                # 1. Analyze campaign brief and generate strategy
-                campaign_strategy = self._analyze_campaign_brief(campaign_brief)
-                
-                # 2. Create master campaign
+                # 4. Create master campaign
                 campaign = self._create_master_campaign(campaign_brief, campaign_strategy)
                 
-                # 3. Generate platform-specific campaigns
-                platform_campaigns = {}
-                for platform_name in campaign_brief.get('preferred_platforms', ['google', 'meta', 'linkedin']):
-                    if platform_name in self.platforms:
-                        platform_campaign = self._generate_platform_campaign(
-                            campaign, platform_name, campaign_strategy
-                        )
-                        platform_campaigns[platform_name] = platform_campaign
+                # 5. Generate platform-specific campaigns
+                platform_campaigns = {
+                    platform_name: self._generate_platform_campaign(
+                        campaign, platform_rows[platform_name], campaign_strategy
+                    )
+                    for platform_name in platform_names
+                }
                 
-                # 4. Generate AI-optimized content variations
-                content_variations = self._generate_content_variations(campaign_brief, campaign_strategy)
+                # Insert every platform's ad set in a single query
+                AdSet.objects.bulk_create([pc['ad_set'] for pc in platform_campaigns.values()])
                 
-                # 5. Create A/B test configurations
+                # 6. Create A/B test configurations
                 ab_test_configs = self._create_ab_test_configurations(campaign, content_variations)
-                
-                return {
-                    'success': True,
-                    'campaign': campaign,
-                    'platform_campaigns': platform_campaigns,
-                    'content_variations': content_variations,
-                    'ab_test_configs': ab_test_configs,
-                    'strategy': campaign_strategy
-                }
+            
+            return {
+                'success': True,
+                'campaign': campaign,
+                'platform_campaigns': platform_campaigns,
+                'content_variations': content_variations,
+                'ab_test_configs': ab_test_configs,
+                # Callers get their own JSON-serializable copy of the shared tables
+                'strategy': _to_builtin(campaign_strategy)
+            }
                 
         except Exception as e:
             logger.error(f"Campaign generation failed: {e}")
@@ -86,22 +390,27 @@ class CampaignGenerator:
     def _analyze_campaign_brief(self, brief: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze campaign brief and generate AI strategy"""
         
+        # Lowercase the free-text fields once for all keyword matching below
+        description_lower = brief['business_description'].lower()
+        goal_lower = brief['campaign_goal'].lower()
+        
         # AI analysis of business description and goals
-        business_type = self._classify_business_type(brief['business_description'])
+        business_type = self._classify_business_type(description_lower)
         audience_segments = self._identify_audience_segments(brief['target_audience'])
-        campaign_objectives = self._map_campaign_objectives(brief['campaign_goal'])
+        campaign_objectives = self._map_campaign_objectives(goal_lower)
+        
+        preferred_platforms = brief.get('preferred_platforms', ['google', 'meta', 'linkedin'])
         
         # Budget allocation strategy
-        budget_allocation = self._calculate_budget_allocation(
-            brief['total_budget'], 
-            brief.get('preferred_platforms', ['google', 'meta', 'linkedin'])
-        )
+        budget_allocation = self._calculate_budget_allocation(brief['total_budget'], preferred_platforms)
         
         # Content strategy
         content_themes = self._generate_content_themes(brief)
         
         # Targeting strategy
-        targeting_strategy = self._generate_targeting_strategy(brief, audience_segments)
+        targeting_strategy = self._generate_targeting_strategy(
+            brief, audience_segments, preferred_platforms, description_lower
+        )
         
         return {
             'business_type': business_type,
@@ -110,41 +419,13 @@ class CampaignGenerator:
             'budget_allocation': budget_allocation,
             'content_themes': content_themes,
             'targeting_strategy': targeting_strategy,
-            'optimization_goals': self._set_optimization_goals(brief['campaign_goal']),
-            'bidding_strategy': self._recommend_bidding_strategy(brief)
+            'optimization_goals': self._set_optimization_goals(goal_lower),
+            'bidding_strategy': self._recommend_bidding_strategy(brief['total_budget'], goal_lower)
         }
     
-    def _classify_business_type(self, description: str) -> Dict[str, Any]:
-        """AI classification of business type from description"""
-        
-        # Keywords for different business types
-        b2b_keywords = ['software', 'saas', 'enterprise', 'business', 'professional', 'consulting']
-        b2c_keywords = ['consumer', 'retail', 'ecommerce', 'shop', 'buy', 'product']
-        service_keywords = ['service', 'agency', 'consulting', 'professional']
-        product_keywords = ['product', 'manufacturing', 'retail', 'ecommerce']
-        
-        description_lower = description.lower()
-        
-        # Simple keyword-based classification (can be enhanced with ML)
-        b2b_score = sum(1 for keyword in b2b_keywords if keyword in description_lower)
-        b2c_score = sum(1 for keyword in b2c_keywords if keyword in description_lower)
-        service_score = sum(1 for keyword in service_keywords if keyword in description_lower)
-        product_score = sum(1 for keyword in product_keywords if keyword in description_lower)
-        
-        primary_type = 'B2B' if b2b_score > b2c_score else 'B2C'
-        secondary_type = 'Service' if service_score > product_score else 'Product'
-        
-        return {
-            'primary': primary_type,
-            'secondary': secondary_type,
-            'confidence': max(b2b_score, b2c_score) / len(description.split()),
-            'characteristics': {
-                'b2b_indicators': b2b_score,
-                'b2c_indicators': b2c_score,
-                'service_indicators': service_score,
-                'product_indicators': product_score
-            }
-        }
+    def _classify_business_type(self, description_lower: str) -> Mapping[str, Any]:
+        """AI classification of business type from the lowercased description"""
+        return _classify_description(description_lower)
     
     def _identify_audience_segments(self, target_audience: str) -> List[Dict[str, Any]]:
         """Identify and segment target audience"""
@@ -169,15 +450,8 @@ class CampaignGenerator:
         
         # Interest identification
         interests = []
-        interest_keywords = {
-            'technology': ['tech', 'software', 'digital', 'innovation'],
-            'business': ['business', 'professional', 'entrepreneur', 'startup'],
-            'lifestyle': ['lifestyle', 'wellness', 'health', 'fitness'],
-            'entertainment': ['entertainment', 'music', 'movies', 'gaming'],
-            'education': ['education', 'learning', 'courses', 'training']
-        }
         
-        for category, keywords in interest_keywords.items():
+        for category, keywords in _INTEREST_KEYWORDS.items():
             if any(keyword in audience_lower for keyword in keywords):
                 interests.append(category)
         
@@ -198,132 +472,43 @@ class CampaignGenerator:
             'size_estimate': 'medium'
         }]
     
-    def _map_campaign_objectives(self, goal: str) -> Dict[str, Any]:
-        """Map campaign goal to platform-specific objectives"""
-        
-        goal_lower = goal.lower()
-        
-        objective_mapping = {
-            'awareness': {
-                'google': 'DISPLAY',
-                'meta': 'BRAND_AWARENESS',
-                'linkedin': 'BRAND_AWARENESS',
-                'primary_kpi': 'impressions',
-                'secondary_kpi': 'reach'
-            },
-            'traffic': {
-                'google': 'SEARCH',
-                'meta': 'LINK_CLICKS',
-                'linkedin': 'WEBSITE_VISITS',
-                'primary_kpi': 'clicks',
-                'secondary_kpi': 'ctr'
-            },
-            'leads': {
-                'google': 'SEARCH',
-                'meta': 'LEAD_GENERATION',
-                'linkedin': 'LEAD_GENERATION',
-                'primary_kpi': 'conversions',
-                'secondary_kpi': 'cpa'
-            },
-            'sales': {
-                'google': 'SHOPPING',
-                'meta': 'CONVERSIONS',
-                'linkedin': 'WEBSITE_CONVERSIONS',
-                'primary_kpi': 'conversions',
-                'secondary_kpi': 'roas'
-            }
-        }
-        
-        # Determine primary objective
-        if any(keyword in goal_lower for keyword in ['awareness', 'brand', 'visibility']):
-            return objective_mapping['awareness']
-        elif any(keyword in goal_lower for keyword in ['traffic', 'visits', 'website']):
-            return objective_mapping['traffic']
-        elif any(keyword in goal_lower for keyword in ['leads', 'signup', 'contact']):
-            return objective_mapping['leads']
-        elif any(keyword in goal_lower for keyword in ['sales', 'purchase', 'buy', 'revenue']):
-            return objective_mapping['sales']
-        else:
-            return objective_mapping['traffic']  # Default
+    def _map_campaign_objectives(self, goal_lower: str) -> Mapping[str, str]:
+        """Map the lowercased campaign goal to platform-specific objectives"""
+        return _objectives_for_goal(goal_lower)
     
     def _calculate_budget_allocation(self, total_budget: float, platforms: List[str]) -> Dict[str, float]:
         """Calculate optimal budget allocation across platforms"""
         
-        # Platform allocation weights based on typical performance
-        platform_weights = {
-            'google': 0.4,  # Generally high intent traffic
-            'meta': 0.35,   # Good for awareness and targeting
-            'linkedin': 0.25  # Best for B2B but more expensive
-        }
-        
-        # Adjust weights based on selected platforms
-        selected_weights = {p: platform_weights.get(p, 0.33) for p in platforms}
-        total_weight = sum(selected_weights.values())
+        # Each platform gets one share, in first-seen order
+        selected = list(dict.fromkeys(platforms))
+        if not selected:
+            return {}
         
-        # Normalize weights
-        normalized_weights = {p: w/total_weight for p, w in selected_weights.items()}
+        # Adjust weights based on selected platforms, then normalize
+        weights = np.array([_PLATFORM_WEIGHTS.get(p, 0.33) for p in selected])
+        weights /= weights.sum()
         
         # Allocate budget
-        allocation = {}
-        for platform, weight in normalized_weights.items():
-            allocation[platform] = total_budget * weight
-        
-        return allocation
+        return dict(zip(selected, (total_budget * weights).tolist()))
     
-    def _generate_content_themes(self, brief: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_content_themes(self, brief: Dict[str, Any]) -> Tuple[Mapping[str, Any], ...]:
         """Generate content themes based on campaign brief"""
         
-        business_desc = brief['business_description'].lower()
-        goal = brief['campaign_goal'].lower()
-        
-        themes = []
-        
-        # Problem-solution theme
-        themes.append({
-            'theme': 'problem_solution',
-            'headline_template': "Solve {problem} with {solution}",
-            'description_template': "Discover how {product_service} helps {target_audience} achieve {benefit}",
-            'cta_options': ['Learn More', 'Get Started', 'Try Now']
-        })
-        
-        # Benefit-focused theme
-        themes.append({
-            'theme': 'benefit_focused',
-            'headline_template': "{benefit} for {target_audience}",
-            'description_template': "Experience {key_benefit} with our {product_service}. Join thousands of satisfied customers.",
-            'cta_options': ['See Benefits', 'Start Today', 'Learn How']
-        })
-        
-        # Urgency theme
-        themes.append({
-            'theme': 'urgency',
-            'headline_template': "Limited Time: {offer}",
-            'description_template': "Don't miss out! Get {benefit} with {product_service}. Offer expires soon.",
-            'cta_options': ['Act Now', 'Claim Offer', 'Get Started']
-        })
-        
-        # Trust/social proof theme
-        themes.append({
-            'theme': 'social_proof',
-            'headline_template': "Join {number}+ Happy Customers",
-            'description_template': "See why {number}+ businesses trust {product_service} for {benefit}",
-            'cta_options': ['Join Now', 'See Reviews', 'Get Started']
-        })
-        
-        return themes
+        # The themes don't depend on the brief yet, so share the static set
+        return _CONTENT_THEMES
     
-    def _generate_targeting_strategy(self, brief: Dict[str, Any], audience_segments: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Generate platform-specific targeting strategies"""
+    def _generate_targeting_strategy(self, brief: Dict[str, Any], audience_segments: List[Dict[str, Any]], platforms: List[str], description_lower: str) -> Dict[str, Any]:
+        """Generate targeting strategies for the selected platforms"""
         
         strategy = {}
         
-        for platform in ['google', 'meta', 'linkedin']:
+        for platform in platforms:
             if platform == 'google':
                 strategy[platform] = self._generate_google_targeting(brief, audience_segments)
             elif platform == 'meta':
                 strategy[platform] = self._generate_meta_targeting(brief, audience_segments)
             elif platform == 'linkedin':
-                strategy[platform] = self._generate_linkedin_targeting(brief, audience_segments)
+                strategy[platform] = self._generate_linkedin_targeting(description_lower)
         
         return strategy
     
@@ -363,8 +548,12 @@ class CampaignGenerator:
             behaviors.extend(segment.get('behaviors', []))
         
         # Demographics
-        age_min = min(r['min'] for s in audience_segments for r in s['age_ranges'])
-        age_max = max(r['max'] for s in audience_segments for r in s['age_ranges'])
+        ages = np.array(
+            [(r['min'], r['max']) for s in audience_segments for r in s['age_ranges']],
+            dtype=np.int16
+        ).reshape(-1, 2)
+        age_min = int(ages[:, 0].min())
+        age_max = int(ages[:, 1].max())
         
         return {
             'interests': interests,
@@ -375,23 +564,21 @@ class CampaignGenerator:
             'genders': [1, 2]  # All genders
         }
     
-    def _generate_linkedin_targeting(self, brief: Dict[str, Any], audience_segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _generate_linkedin_targeting(self, description_lower: str) -> Dict[str, Any]:
         """Generate LinkedIn targeting strategy"""
         
-        business_type = brief.get('business_description', '').lower()
-        
         # Job titles based on business type
         job_titles = []
-        if 'marketing' in business_type:
+        if 'marketing' in description_lower:
             job_titles.extend(['25', '26'])  # Marketing roles
-        if 'technology' in business_type or 'software' in business_type:
+        if 'technology' in description_lower or 'software' in description_lower:
             job_titles.extend(['26', '27'])  # Tech roles
         
         # Industries
         industries = []
-        if 'technology' in business_type:
+        if 'technology' in description_lower:
             industries.append('6')  # IT and Services
-        if 'marketing' in business_type:
+        if 'marketing' in description_lower:
             industries.append('7')  # Marketing and Advertising
         
         # Seniority levels
@@ -404,41 +591,17 @@ class CampaignGenerator:
             'locations': ['103644278']  # United States
         }
     
-    def _set_optimization_goals(self, campaign_goal: str) -> Dict[str, str]:
+    def _set_optimization_goals(self, goal_lower: str) -> Mapping[str, str]:
         """Set optimization goals for each platform"""
         
-        goal_lower = campaign_goal.lower()
+        for goal in ('awareness', 'traffic', 'leads'):
+            if goal in goal_lower:
+                return _OPTIMIZATION_GOALS[goal]
         
-        if 'awareness' in goal_lower:
-            return {
-                'google': 'MAXIMIZE_IMPRESSIONS',
-                'meta': 'REACH',
-                'linkedin': 'BRAND_AWARENESS'
-            }
-        elif 'traffic' in goal_lower:
-            return {
-                'google': 'MAXIMIZE_CLICKS',
-                'meta': 'LINK_CLICKS',
-                'linkedin': 'WEBSITE_VISITS'
-            }
-        elif 'leads' in goal_lower:
-            return {
-                'google': 'MAXIMIZE_CONVERSIONS',
-                'meta': 'LEAD_GENERATION',
-                'linkedin': 'LEAD_GENERATION'
-            }
-        else:
-            return {
-                'google': 'MAXIMIZE_CONVERSION_VALUE',
-                'meta': 'CONVERSIONS',
-                'linkedin': 'WEBSITE_CONVERSIONS'
-            }
+        return _OPTIMIZATION_GOALS['conversions']
     
-    def _recommend_bidding_strategy(self, brief: Dict[str, Any]) -> Dict[str, Any]:
-        """Recommend bidding strategy based on campaign goals and budget"""
-        
-        budget = brief['total_budget']
-        goal = brief['campaign_goal'].lower()
+    def _recommend_bidding_strategy(self, budget: float, goal: str) -> Dict[str, Any]:
+        """Recommend bidding strategy based on the lowercased campaign goal and budget"""
         
         if budget < 1000:  # Small budget
             return {
@@ -465,15 +628,10 @@ class CampaignGenerator:
     def _extract_keywords_from_description(self, description: str) -> List[str]:
         """Extract relevant keywords from business description"""
         
-        # Simple keyword extraction (can be enhanced with NLP)
-        words = description.lower().split()
-        
-        # Filter out common words
-        stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'a', 'an'}
-        keywords = [word.strip('.,!?') for word in words if word not in stop_words and len(word) > 3]
-        
-        # Return top keywords
-        return keywords[:20]
+        # Simple keyword extraction (can be enhanced with NLP); the campaign and
+        # its Google targeting both extract from the same description, so the
+        # work is memoized and each caller gets its own list
+        return list(_extract_keywords(description))
     
     def _create_master_campaign(self, brief: Dict[str, Any], strategy: Dict[str, Any]) -> Campaign:
         """Create the master campaign object"""
@@ -499,30 +657,16 @@ class CampaignGenerator:
     
     def _map_goal_to_type(self, goal: str) -> str:
         """Map campaign goal to campaign type"""
-        
-        goal_lower = goal.lower()
-        
-        if 'awareness' in goal_lower or 'brand' in goal_lower:
-            return 'awareness'
-        elif 'traffic' in goal_lower or 'visits' in goal_lower:
-            return 'traffic'
-        elif 'engagement' in goal_lower:
-            return 'engagement'
-        elif 'leads' in goal_lower or 'signup' in goal_lower:
-            return 'leads'
-        elif 'sales' in goal_lower or 'purchase' in goal_lower:
-            return 'sales'
-        else:
-            return 'conversions'
+        return _campaign_type_for_goal(goal)
     
-    def _generate_platform_campaign(self, campaign: Campaign, platform_name: str, strategy: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_platform_campaign(self, campaign: Campaign, platform: AdPlatform, strategy: Dict[str, Any]) -> Dict[str, Any]:
         """Generate platform-specific campaign configuration"""
         
-        platform = AdPlatform.objects.get(name=platform_name)
+        platform_name = platform.name
         budget_allocation = strategy['budget_allocation'][platform_name]
         
-        # Create ad set for this platform
-        ad_set = AdSet.objects.create(
+        # Build the ad set for this platform; the caller saves all of them at once
+        ad_set = AdSet(
             campaign=campaign,
             platform=platform,
             name=f"{campaign.name} - {platform.get_name_display()}",
@@ -541,18 +685,32 @@ class CampaignGenerator:
         """Generate AI-optimized content variations for A/B testing"""
         
         variations = []
-        themes = strategy['content_themes']
+        themes = strategy['content_themes'][:3]  # Generate 3 main variations
+        
+        # Simulated AI confidence, drawn for all variations at once
+        confidence_scores = _rng.uniform(0.7, 0.95, size=len(themes)).tolist()
         
-        for i, theme in enumerate(themes[:3]):  # Generate 3 main variations
+        # Template contexts are the same for every theme, so resolve them once
+        headline_context = {
+            'product_service': brief.get('product_service', 'Our Solution'),
+            'target_audience': brief.get('target_audience', 'Businesses')
+        }
+        product_service = brief.get('product_service', 'our solution')
+        description_context = {
+            'product_service': product_service,
+            'product_service_title': product_service.title()
+        }
+        
+        for i, theme in enumerate(themes):
             
             # Generate headlines
-            headlines = self._generate_headlines(brief, theme)
+            headlines = self._generate_headlines(headline_context, theme)
             
             # Generate descriptions
-            descriptions = self._generate_descriptions(brief, theme)
+            descriptions = self._generate_descriptions(description_context, theme)
             
             # Generate CTAs
-            ctas = theme['cta_options']
+            ctas = list(theme['cta_options'])
             
             variation = {
                 'variation_id': i + 1,
@@ -560,133 +718,65 @@ class CampaignGenerator:
                 'headlines': headlines,
                 'descriptions': descriptions,
                 'ctas': ctas,
-                'confidence_score': random.uniform(0.7, 0.95)  # Simulated AI confidence
+                'confidence_score': confidence_scores[i]
             }
             
             variations.append(variation)
         
         return variations
     
-    def _generate_headlines(self, brief: Dict[str, Any], theme: Dict[str, Any]) -> List[str]:
+    def _generate_headlines(self, context: Dict[str, str], theme: Dict[str, Any]) -> List[str]:
         """Generate headline variations based on theme"""
         
-        product_service = brief.get('product_service', 'Our Solution')
-        target_audience = brief.get('target_audience', 'Businesses')
-        
         # Template-based generation (can be enhanced with AI/NLP)
-        templates = {
-            'problem_solution': [
-                f"Solve Your Biggest Challenge with {product_service}",
-                f"The Solution {target_audience} Have Been Waiting For",
-                f"Transform Your Business with {product_service}"
-            ],
-            'benefit_focused': [
-                f"Increase Efficiency with {product_service}",
-                f"Save Time and Money with {product_service}",
-                f"Get Better Results with {product_service}"
-            ],
-            'urgency': [
-                f"Limited Time: Special Offer on {product_service}",
-                f"Don't Miss Out - {product_service} Available Now",
-                f"Act Fast: Exclusive {product_service} Deal"
-            ],
-            'social_proof': [
-                f"Join 10,000+ Happy Customers",
-                f"Trusted by Industry Leaders",
-                f"The #1 Choice for {target_audience}"
-            ]
-        }
-        
-        return templates.get(theme['theme'], templates['benefit_focused'])
+        templates = _HEADLINE_TEMPLATES.get(theme['theme'], _HEADLINE_TEMPLATES['benefit_focused'])
+        return [template.format_map(context) for template in templates]
     
-    def _generate_descriptions(self, brief: Dict[str, Any], theme: Dict[str, Any]) -> List[str]:
+    def _generate_descriptions(self, context: Dict[str, str], theme: Dict[str, Any]) -> List[str]:
         """Generate description variations based on theme"""
         
-        product_service = brief.get('product_service', 'our solution')
-        business_desc = brief.get('business_description', 'your business')
-        
         # Template-based generation
-        templates = {
-            'problem_solution': [
-                f"Discover how {product_service} solves your biggest challenges and drives real results.",
-                f"Stop struggling with inefficient processes. {product_service.title()} streamlines everything.",
-                f"Get the solution that actually works. Proven results for businesses like yours."
-            ],
-            'benefit_focused': [
-                f"Experience the benefits that matter most to your business success.",
-                f"Save time, reduce costs, and improve outcomes with {product_service}.",
-                f"Get more done in less time with our proven {product_service}."
-            ],
-            'urgency': [
-                f"Limited time offer - don't miss your chance to save and improve your results.",
-                f"Special pricing available now. Join thousands of satisfied customers today.",
-                f"Exclusive offer ends soon. Start transforming your business now."
-            ],
-            'social_proof': [
-                f"See why thousands of businesses trust us for their {product_service} needs.",
-                f"Join the community of successful businesses that chose {product_service}.",
-                f"Proven track record with industry-leading customer satisfaction."
-            ]
-        }
-        
-        return templates.get(theme['theme'], templates['benefit_focused'])
+        templates = _DESCRIPTION_TEMPLATES.get(theme['theme'], _DESCRIPTION_TEMPLATES['benefit_focused'])
+        return [template.format_map(context) for template in templates]
     
     def _create_ab_test_configurations(self, campaign: Campaign, content_variations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Create A/B test configurations for content variations"""
         
         from ..models import ABTest
         
-        ab_tests = []
-        
-        # Create headline A/B test
-        headline_test = ABTest.objects.create(
-            campaign=campaign,
-            name=f"{campaign.name} - Headline Test",
-            test_type='headline',
-            confidence_level=0.95,
-            minimum_sample_size=1000,
-            test_duration_days=7,
-            status='draft'
-        )
-        
-        ab_tests.append({
-            'test': headline_test,
-            'variations': [var['headlines'] for var in content_variations],
-            'type': 'headline'
-        })
-        
-        # Create description A/B test
-        description_test = ABTest.objects.create(
-            campaign=campaign,
-            name=f"{campaign.name} - Description Test",
-            test_type='description',
-            confidence_level=0.95,
-            minimum_sample_size=1000,
-            test_duration_days=7,
-            status='draft'
-        )
-        
-        ab_tests.append({
-            'test': description_test,
-            'variations': [var['descriptions'] for var in content_variations],
-            'type': 'description'
-        })
-        
-        # Create CTA A/B test
-        cta_test = ABTest.objects.create(
-            campaign=campaign,
-            name=f"{campaign.name} - CTA Test",
-            test_type='cta',
-            confidence_level=0.95,
-            minimum_sample_size=500,
-            test_duration_days=5,
-            status='draft'
-        )
+        # (name suffix, test type, variation key, minimum sample size, duration days)
+        test_specs = [
+            ('Headline Test', 'headline', 'headlines', 1000, 7),
+            ('Description Test', 'description', 'descriptions', 1000, 7),
+            ('CTA Test', 'cta', 'ctas', 500, 5)
+        ]
+        
+        # Settings shared by every test
+        common_fields = {
+            'campaign': campaign,
+            'confidence_level': 0.95,
+            'status': 'draft'
+        }
         
-        ab_tests.append({
-            'test': cta_test,
-            'variations': [var['ctas'] for var in content_variations],
-            'type': 'cta'
-        })
+        # Create all A/B tests in a single query
+        tests = ABTest.objects.bulk_create([
+            ABTest(
+                name=f"{campaign.name} - {name_suffix}",
+                test_type=test_type,
+                minimum_sample_size=minimum_sample_size,
+                test_duration_days=duration_days,
+                **common_fields
+            )
+            for name_suffix, test_type, _, minimum_sample_size, duration_days in test_specs
+        ])
+        
+        ab_tests = [
+            {
+                'test': test,
+                'variations': list(map(operator.itemgetter(variation_key), content_variations)),
+                'type': test_type
+            }
+            for test, (_, test_type, variation_key, _, _) in zip(tests, test_specs)
+        ]
         
         return ab_tests
\ No newline at end of file
@@ -0,0 +1,240 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:08
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdPlatform',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(choices=[('google', 'Google Ads'), ('meta', 'Meta (Facebook/Instagram)'), ('linkedin', 'LinkedIn Campaign Manager')], max_length=50, unique=True)),
+                ('api_endpoint', models.URLField()),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AdSet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('platform_ad_set_id', models.CharField(blank=True, max_length=255)),
+                ('allocated_budget', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('spent_budget', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('targeting_parameters', models.JSONField(default=dict)),
+                ('impressions', models.BigIntegerField(default=0)),
+                ('clicks', models.BigIntegerField(default=0)),
+                ('conversions', models.BigIntegerField(default=0)),
+                ('ctr', models.FloatField(default=0.0)),
+                ('cpc', models.FloatField(default=0.0)),
+                ('cpa', models.FloatField(default=0.0)),
+                ('roas', models.FloatField(default=0.0)),
+                ('status', models.CharField(default='active', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('platform', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='neuro_ads.adplatform')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AdCreative',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('creative_type', models.CharField(choices=[('text', 'Text Ad'), ('image', 'Image Ad'), ('video', 'Video Ad'), ('carousel', 'Carousel Ad'), ('collection', 'Collection Ad')], max_length=20)),
+                ('headline', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('call_to_action', models.CharField(max_length=100)),
+                ('destination_url', models.URLField()),
+                ('image_url', models.URLField(blank=True)),
+                ('video_url', models.URLField(blank=True)),
+                ('media_assets', models.JSONField(default=list)),
+                ('impressions', models.BigIntegerField(default=0)),
+                ('clicks', models.BigIntegerField(default=0)),
+                ('conversions', models.BigIntegerField(default=0)),
+                ('ctr', models.FloatField(default=0.0)),
+                ('conversion_rate', models.FloatField(default=0.0)),
+                ('ai_confidence_score', models.FloatField(default=0.0, validators=[django.core.validators.MinValueValidator(0.0), django.core.validators.MaxValueValidator(1.0)])),
+                ('variant_index', models.PositiveSmallIntegerField(blank=True, db_index=True, null=True)),
+                ('is_winner', models.BooleanField(default=False)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('ad_set', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='neuro_ads.adset')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AutomationRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('rule_type', models.CharField(choices=[('budget_increase', 'Increase Budget'), ('budget_decrease', 'Decrease Budget'), ('pause_ad', 'Pause Ad'), ('activate_ad', 'Activate Ad'), ('bid_adjustment', 'Bid Adjustment')], max_length=50)),
+                ('condition', models.CharField(choices=[('ctr_above', 'CTR Above Threshold'), ('ctr_below', 'CTR Below Threshold'), ('cpa_above', 'CPA Above Threshold'), ('cpa_below', 'CPA Below Threshold'), ('roas_above', 'ROAS Above Threshold'), ('roas_below', 'ROAS Below Threshold'), ('spend_threshold', 'Spend Threshold Reached')], max_length=50)),
+                ('threshold_value', models.FloatField()),
+                ('action_value', models.FloatField()),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Campaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('campaign_type', models.CharField(choices=[('awareness', 'Brand Awareness'), ('traffic', 'Website Traffic'), ('engagement', 'Engagement'), ('leads', 'Lead Generation'), ('conversions', 'Conversions'), ('sales', 'Sales')], max_length=50)),
+                ('target_audience', models.JSONField(default=dict)),
+                ('total_budget', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('daily_budget', models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True)),
+                ('ai_generated_copy', models.JSONField(default=dict)),
+                ('ai_generated_keywords', models.JSONField(default=list)),
+                ('ai_target_suggestions', models.JSONField(default=dict)),
+                ('auto_optimization', models.BooleanField(default=True)),
+                ('auto_budget_reallocation', models.BooleanField(default=True)),
+                ('auto_ab_testing', models.BooleanField(default=True)),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('active', 'Active'), ('paused', 'Paused'), ('completed', 'Completed'), ('error', 'Error')], default='draft', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('ended_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BudgetOptimization',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('previous_allocation', models.JSONField(default=dict)),
+                ('new_allocation', models.JSONField(default=dict)),
+                ('optimization_reason', models.TextField()),
+                ('performance_metrics', models.JSONField(default=dict)),
+                ('expected_roas_improvement', models.FloatField(default=0.0)),
+                ('applied_at', models.DateTimeField(auto_now_add=True)),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='neuro_ads.campaign')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='adset',
+            name='campaign',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='neuro_ads.campaign'),
+        ),
+        migrations.CreateModel(
+            name='ABTest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('test_type', models.CharField(choices=[('headline', 'Headline Test'), ('description', 'Description Test'), ('cta', 'Call-to-Action Test'), ('creative', 'Creative Test'), ('audience', 'Audience Test')], max_length=20)),
+                ('confidence_level', models.FloatField(default=0.95)),
+                ('minimum_sample_size', models.IntegerField(default=1000)),
+                ('test_duration_days', models.IntegerField(default=7)),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('running', 'Running'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], default='draft', max_length=20)),
+                ('statistical_significance', models.FloatField(blank=True, null=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('winner_creative', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='won_tests', to='neuro_ads.adcreative')),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='neuro_ads.campaign')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CampaignAnalytics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('impressions', models.BigIntegerField(default=0)),
+                ('clicks', models.BigIntegerField(default=0)),
+                ('conversions', models.BigIntegerField(default=0)),
+                ('spend', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('ctr', models.FloatField(default=0.0)),
+                ('cpc', models.FloatField(default=0.0)),
+                ('cpa', models.FloatField(default=0.0)),
+                ('roas', models.FloatField(default=0.0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('ad_set', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='neuro_ads.adset')),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='neuro_ads.campaign')),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PlatformCredentials',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('api_key', models.TextField(blank=True)),
+                ('api_secret', models.TextField(blank=True)),
+                ('access_token', models.TextField(blank=True)),
+                ('refresh_token', models.TextField(blank=True)),
+                ('account_id', models.CharField(blank=True, max_length=255)),
+                ('is_active', models.BooleanField(default=True)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('platform', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='neuro_ads.adplatform')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='adcreative',
+            index=models.Index(fields=['ad_set', 'created_at'], name='creative_adset_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='automationrule',
+            index=models.Index(fields=['user', '-created_at'], name='rule_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(fields=['user', '-created_at'], name='campaign_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(fields=['user', 'status', '-created_at'], name='campaign_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='budgetoptimization',
+            index=models.Index(fields=['campaign', '-applied_at'], name='budgetopt_campaign_applied_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='adset',
+            unique_together={('campaign', 'platform')},
+        ),
+        migrations.AddIndex(
+            model_name='abtest',
+            index=models.Index(fields=['campaign', '-created_at'], name='abtest_campaign_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='abtest',
+            index=models.Index(condition=models.Q(('status', 'running')), fields=['campaign'], name='abtest_running_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campaignanalytics',
+            index=models.Index(fields=['campaign', '-date'], include=('impressions', 'clicks', 'conversions', 'spend', 'revenue'), name='analytics_campaign_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campaignanalytics',
+            index=models.Index(fields=['ad_set', '-date'], name='analytics_adset_date_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='campaignanalytics',
+            unique_together={('campaign', 'ad_set', 'date')},
+        ),
+        migrations.AddConstraint(
+            model_name='platformcredentials',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('user', 'platform'), name='uniq_active_platform_credentials'),
+        ),
+    ]
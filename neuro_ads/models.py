@@ -1,8 +1,10 @@
 from django.db import models
-from django.contrib.auth.models import User
+from django.db.models import Prefetch, Q, Sum
+from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 import json
+from decimal import Decimal
 
 
 class AdPlatform(models.Model):
@@ -24,7 +26,7 @@ class AdPlatform(models.Model):
 
 class PlatformCredentials(models.Model):
     """Store API credentials for each platform per user"""
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     platform = models.ForeignKey(AdPlatform, on_delete=models.CASCADE)
     
     # Encrypted credential fields
@@ -40,12 +42,29 @@ class PlatformCredentials(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
-        unique_together = ['user', 'platform']
+        constraints = [
+            # Only one live credential per platform; deactivated ones are kept
+            # as history so credentials can be rotated
+            models.UniqueConstraint(
+                fields=['user', 'platform'],
+                condition=Q(is_active=True),
+                name='uniq_active_platform_credentials',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.platform.name}"
 
 
+class CampaignManager(models.Manager):
+    """Campaign manager with a preloading helper for views that walk ad sets"""
+    
+    def with_related(self):
+        return self.prefetch_related(
+            Prefetch('adset_set', queryset=AdSet.objects.select_related('platform'))
+        )
+
+
 class Campaign(models.Model):
     """AI-generated autonomous advertising campaigns"""
     STATUS_CHOICES = [
@@ -65,7 +84,7 @@ class Campaign(models.Model):
         ('sales', 'Sales'),
     ]
     
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     
@@ -94,8 +113,15 @@ class Campaign(models.Model):
     started_at = models.DateTimeField(null=True, blank=True)
     ended_at = models.DateTimeField(null=True, blank=True)
     
+    objects = CampaignManager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # A user's campaigns, newest first, optionally narrowed by status
+            models.Index(fields=['user', '-created_at'], name='campaign_user_created_idx'),
+            models.Index(fields=['user', 'status', '-created_at'], name='campaign_user_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.campaign_type})"
@@ -106,7 +132,8 @@ class Campaign(models.Model):
     
     @property
     def total_spent(self):
-        return sum(ad_set.total_spent for ad_set in self.adset_set.all())
+        spent = self.adset_set.aggregate(spent_total=Sum('spent_budget'))['spent_total']
+        return spent or Decimal('0')
 
 
 class AdSet(models.Model):
@@ -145,7 +172,7 @@ class AdSet(models.Model):
     
     @property
     def total_spent(self):
-        return float(self.spent_budget)
+        return self.spent_budget
 
 
 class AdCreative(models.Model):
@@ -187,10 +214,18 @@ class AdCreative(models.Model):
         validators=[MinValueValidator(0.0), MaxValueValidator(1.0)]
     )
     
+    # Position of the creative within its A/B test (0 = variant A)
+    variant_index = models.PositiveSmallIntegerField(null=True, blank=True, db_index=True)
+    
     is_winner = models.BooleanField(default=False)  # A/B test winner
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['ad_set', 'created_at'], name='creative_adset_created_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.name} ({self.creative_type})"
 
@@ -236,6 +271,13 @@ class ABTest(models.Model):
     completed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['campaign', '-created_at'], name='abtest_campaign_created_idx'),
+            # Running tests are a small slice of the table; the dashboard counts them per user
+            models.Index(fields=['campaign'], condition=Q(status='running'), name='abtest_running_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.name} - {self.test_type}"
 
@@ -259,6 +301,11 @@ class BudgetOptimization(models.Model):
     
     applied_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['campaign', '-applied_at'], name='budgetopt_campaign_applied_idx'),
+        ]
+    
     def __str__(self):
         return f"Budget optimization for {self.campaign.name} at {self.applied_at}"
 
@@ -288,6 +335,17 @@ class CampaignAnalytics(models.Model):
     class Meta:
         unique_together = ['campaign', 'ad_set', 'date']
         ordering = ['-date']
+        indexes = [
+            # A campaign's rows, newest first; the aggregated metrics ride along
+            # as non-key columns so date-range sums can be answered from the
+            # index without widening its key
+            models.Index(
+                fields=['campaign', '-date'],
+                include=['impressions', 'clicks', 'conversions', 'spend', 'revenue'],
+                name='analytics_campaign_date_idx',
+            ),
+            models.Index(fields=['ad_set', '-date'], name='analytics_adset_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.campaign.name} analytics for {self.date}"
@@ -313,7 +371,7 @@ class AutomationRule(models.Model):
         ('spend_threshold', 'Spend Threshold Reached'),
     ]
     
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     name = models.CharField(max_length=255)
     
     # Rule configuration
@@ -327,5 +385,10 @@ class AutomationRule(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='rule_user_created_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.name} - {self.rule_type}"
@@ -4,6 +4,8 @@ Base platform service class for common functionality
 
 import requests
 import logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any
 from django.conf import settings
@@ -16,10 +18,33 @@ logger = logging.getLogger(__name__)
 class BasePlatformService(ABC):
     """Base class for all advertising platform integrations"""
     
+    # Connection pooling and retries for the platform API session
+    pool_maxsize = 50
+    max_retries = 3
+    retry_backoff_factor = 0.3
+    retry_status_codes = (429, 500, 502, 503, 504)
+    
     def __init__(self, user, platform_name: str):
         self.user = user
         self.platform_name = platform_name
         self.credentials = self._get_credentials()
+        self.session = self._create_session()
+        # Built on first request; authenticate() clears it when credentials change
+        self._auth_headers = None
+    
+    def _create_session(self) -> requests.Session:
+        """Create a keep-alive session so API calls reuse pooled connections"""
+        # Retry's default allowed methods are the idempotent ones, so POSTs that
+        # create platform objects are never replayed
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.retry_backoff_factor,
+            status_forcelist=self.retry_status_codes,
+            raise_on_status=False
+        )
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(pool_maxsize=self.pool_maxsize, max_retries=retry))
+        return session
         
     def _get_credentials(self) -> Optional[PlatformCredentials]:
         """Get user credentials for this platform"""
@@ -100,12 +125,15 @@ class BasePlatformService(ABC):
             logger.error(f"Not authenticated for {self.platform_name}")
             return None
         
+        if self._auth_headers is None:
+            self._auth_headers = self._get_auth_headers()
+        
         headers = kwargs.get('headers', {})
-        headers.update(self._get_auth_headers())
+        headers.update(self._auth_headers)
         kwargs['headers'] = headers
         
         try:
-            response = requests.request(method, url, **kwargs)
+            response = self.session.request(method, url, **kwargs)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -29,6 +29,7 @@ class GoogleAdsService(BasePlatformService):
                 self.credentials.refresh_token = auth_data.get('refresh_token', '')
                 self.credentials.account_id = auth_data.get('customer_id', '')
                 self.credentials.save()
+                self._auth_headers = None
             
             return True
         except Exception as e:
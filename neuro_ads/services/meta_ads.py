@@ -26,6 +26,7 @@ class MetaAdsService(BasePlatformService):
                 self.credentials.access_token = auth_data.get('access_token', '')
                 self.credentials.account_id = auth_data.get('ad_account_id', '')
                 self.credentials.save()
+                self._auth_headers = None
             
             return True
         except Exception as e:
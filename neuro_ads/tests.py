@@ -1,3 +1,382 @@
-from django.test import TestCase
+import json
+import math
+from datetime import date, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from scipy import stats
+
+from .ai.ab_testing import ABTestEngine
+from .ai.budget_optimizer import BudgetOptimizer
+from .ai.campaign_generator import CampaignGenerator
+from .models import AdCreative, AdPlatform, AdSet, ABTest, BudgetOptimization, Campaign, CampaignAnalytics
+
+
+class ABTestStatisticsTests(SimpleTestCase):
+    """The vectorized significance tests against textbook scalar formulas"""
+    
+    def setUp(self):
+        self.engine = ABTestEngine()
+    
+    def _reference_z_test(self, successes_a, trials_a, successes_b, trials_b):
+        p_a, p_b = successes_a / trials_a, successes_b / trials_b
+        p_pool = (successes_a + successes_b) / (trials_a + trials_b)
+        z = (p_a - p_b) / math.sqrt(p_pool * (1 - p_pool) * (1 / trials_a + 1 / trials_b))
+        return z, 2 * stats.norm.sf(abs(z))
+    
+    def test_pairwise_z_tests_match_scalar_formula_in_pair_order(self):
+        successes = np.array([30.0, 45.0, 38.0])
+        trials = np.array([1000.0, 1000.0, 900.0])
+        
+        results = self.engine._pairwise_two_proportion_z_tests(successes, trials)
+        
+        self.assertEqual([(i, j) for i, j, _ in results], [(0, 1), (0, 2), (1, 2)])
+        for i, j, result in results:
+            z, p_value = self._reference_z_test(successes[i], trials[i], successes[j], trials[j])
+            self.assertAlmostEqual(result['z_score'], z)
+            self.assertAlmostEqual(result['p_value'], p_value)
+            self.assertEqual(result['winner'], 'A' if successes[i] / trials[i] > successes[j] / trials[j] else 'B')
+    
+    def test_pairwise_z_tests_mark_empty_variants_inconclusive(self):
+        results = self.engine._pairwise_two_proportion_z_tests(np.array([0.0, 10.0]), np.array([0.0, 100.0]))
+        
+        self.assertEqual(results, [(0, 1, {'p_value': 1.0, 'effect_size': 0, 'winner': 'inconclusive'})])
+    
+    def test_every_test_type_is_analyzed_with_the_z_test(self):
+        test_data = [
+            {'variant_type': 'A', 'impressions': 1000, 'clicks': 30, 'conversions': 3, 'spend': 30.0},
+            {'variant_type': 'B', 'impressions': 1000, 'clicks': 45, 'conversions': 5, 'spend': 30.0},
+        ]
+        z, p_value = self._reference_z_test(30, 1000, 45, 1000)
+        
+        for test_type, metric in (('headline', 'ctr'), ('creative', 'conversion_rate'), ('audience', 'ctr')):
+            analysis = self.engine._perform_statistical_analysis(test_data, test_type)
+            
+            [result] = analysis['statistical_tests']
+            self.assertEqual(result['metric'], metric)
+            self.assertAlmostEqual(result['p_value'], p_value)
+            self.assertEqual(result['winner'], 'B')
+
+
+class ABTestDataTests(TestCase):
+    """Sample statistics the A/B test engine derives from campaign analytics"""
+    
+    def setUp(self):
+        user = get_user_model().objects.create_user(username='advertiser', password='secret')
+        self.campaign = Campaign.objects.create(
+            user=user, name='Spring Sale', campaign_type='traffic', total_budget=1000
+        )
+        self.ad_sets = [
+            AdSet.objects.create(
+                campaign=self.campaign,
+                platform=AdPlatform.objects.create(name=name, api_endpoint=f'https://{name}.example.com'),
+                name=name,
+                allocated_budget=500
+            )
+            for name in ('google', 'meta')
+        ]
+        self.ab_test = ABTest.objects.create(
+            campaign=self.campaign,
+            name='Headline Test',
+            test_type='headline',
+            status='running',
+            started_at=timezone.now() - timedelta(days=5)
+        )
+        for index in range(2):
+            AdCreative.objects.create(
+                ad_set=self.ad_sets[0],
+                name=f'Variant {index + 1}',
+                creative_type='text',
+                headline='Headline',
+                description='Description',
+                call_to_action='Learn More',
+                destination_url='https://example.com',
+                variant_index=index
+            )
+    
+    def test_totals_cover_every_ad_set_in_the_test_window(self):
+        start = self.ab_test.started_at.date()
+        for offset in range(4):
+            for ad_set in self.ad_sets:
+                CampaignAnalytics.objects.create(
+                    campaign=self.campaign,
+                    ad_set=ad_set,
+                    date=start + timedelta(days=offset),
+                    impressions=1000,
+                    clicks=10,
+                    conversions=1,
+                    spend=20
+                )
+        # Before the test started, so not part of it
+        CampaignAnalytics.objects.create(
+            campaign=self.campaign,
+            ad_set=self.ad_sets[0],
+            date=start - timedelta(days=1),
+            impressions=5000,
+            clicks=50,
+            conversions=5,
+            spend=100
+        )
+        
+        test_data = ABTestEngine()._get_test_data(self.ab_test)
+        
+        self.assertEqual(len(test_data), 2)
+        self.assertEqual(test_data[0]['impressions'], 8000)
+        self.assertEqual(test_data[0]['clicks'], 80)
+        self.assertEqual(test_data[0]['spend'], 160.0)
+        self.assertAlmostEqual(test_data[0]['cpc'], 2.0)
+        self.assertAlmostEqual(test_data[0]['ctr'], 1.0)
+
+
+    def test_small_sample_stops_before_loading_test_data(self):
+        CampaignAnalytics.objects.create(
+            campaign=self.campaign,
+            ad_set=self.ad_sets[0],
+            date=self.ab_test.started_at.date(),
+            impressions=400,
+            clicks=10,
+            conversions=1,
+            spend=10
+        )
+        cache.clear()
+        
+        # Only the impressions SUM runs
+        with self.assertNumQueries(1):
+            result = ABTestEngine().run_ab_test_analysis(self.ab_test)
+        
+        self.assertEqual(result['recommendation'], 'Continue test - minimum sample size not reached')
+
+
+class BudgetOptimizerTests(TestCase):
+    """Budget reallocation between a strong and a weak ad set"""
+    
+    def setUp(self):
+        cache.clear()
+        user = get_user_model().objects.create_user(username='advertiser', password='secret')
+        self.campaign = Campaign.objects.create(
+            user=user, name='Spring Sale', campaign_type='traffic', total_budget=1000
+        )
+        # (clicks, conversions, spend, revenue) over the lookback window
+        performance = {
+            'google': (300, 30, 450, 2250),
+            'meta': (100, 3, 450, 90),
+        }
+        yesterday = date.today() - timedelta(days=1)
+        self.ad_sets = {}
+        for name, (clicks, conversions, spend, revenue) in performance.items():
+            ad_set = AdSet.objects.create(
+                campaign=self.campaign,
+                platform=AdPlatform.objects.create(name=name, api_endpoint=f'https://{name}.example.com'),
+                name=name,
+                allocated_budget=500
+            )
+            CampaignAnalytics.objects.create(
+                campaign=self.campaign,
+                ad_set=ad_set,
+                date=yesterday,
+                impressions=10000,
+                clicks=clicks,
+                conversions=conversions,
+                spend=spend,
+                revenue=revenue
+            )
+            self.ad_sets[name] = ad_set
+    
+    def test_performance_scores_rank_ad_sets(self):
+        optimizer = BudgetOptimizer()
+        totals = optimizer._get_analytics_totals(self.campaign, date.today() - timedelta(days=7), date.today())
+        ad_sets, performance_data = optimizer._get_performance_data(list(self.ad_sets.values()), totals)
+        
+        metrics = optimizer._calculate_performance_metrics(ad_sets, performance_data)
+        
+        self.assertEqual([ad_set.name for ad_set in metrics['ad_sets']], ['google', 'meta'])
+        np.testing.assert_allclose(metrics['columns']['roas'], [5.0, 0.2])
+        np.testing.assert_allclose(metrics['columns']['cpa'], [15.0, 150.0])
+        np.testing.assert_allclose(metrics['columns']['spend_utilization'], [0.9, 0.9])
+        self.assertAlmostEqual(metrics['campaign_averages']['avg_roas'], 2.6)
+    
+    def test_budget_moves_from_weak_to_strong_ad_set_within_daily_limit(self):
+        result = BudgetOptimizer().optimize_campaign_budgets(self.campaign)
+        
+        self.assertTrue(result['success'], result)
+        budgets = {ad_set.name: float(ad_set.allocated_budget) for ad_set in AdSet.objects.filter(campaign=self.campaign)}
+        # The weak ad set loses the 20% daily maximum and all of it goes to the strong one
+        self.assertEqual(budgets, {'google': 600.0, 'meta': 400.0})
+        
+        optimization = BudgetOptimization.objects.get(campaign=self.campaign)
+        self.assertEqual(optimization.previous_allocation[str(self.ad_sets['meta'].id)], 500.0)
+        self.assertEqual(optimization.new_allocation[str(self.ad_sets['google'].id)], 600.0)
+    
+    def test_single_ad_set_is_not_optimized(self):
+        self.ad_sets['meta'].delete()
+        
+        result = BudgetOptimizer().optimize_campaign_budgets(self.campaign)
+        
+        self.assertEqual(result, {'success': False, 'reason': 'Need at least 2 ad sets for budget optimization'})
+
+
+class CampaignSpendTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(username='advertiser', password='secret')
+        self.campaign = Campaign.objects.create(
+            user=user, name='Spring Sale', campaign_type='traffic', total_budget=1000
+        )
+    
+    def test_total_spent_sums_ad_sets_as_decimal(self):
+        for name, spent in (('google', '120.10'), ('meta', '79.95')):
+            AdSet.objects.create(
+                campaign=self.campaign,
+                platform=AdPlatform.objects.create(name=name, api_endpoint=f'https://{name}.example.com'),
+                name=name,
+                allocated_budget=500,
+                spent_budget=Decimal(spent)
+            )
+        
+        self.assertEqual(self.campaign.total_spent, Decimal('200.05'))
+    
+    def test_total_spent_without_ad_sets_is_zero(self):
+        self.assertEqual(self.campaign.total_spent, Decimal('0'))
+
+
+class CampaignGeneratorTests(TestCase):
+    """End-to-end campaign generation from a brief"""
+    
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='advertiser', password='secret')
+        for name in ('google', 'meta', 'linkedin'):
+            AdPlatform.objects.create(name=name, api_endpoint=f'https://{name}.example.com')
+        self.brief = {
+            'business_description': 'Enterprise software consulting for professional services firms',
+            'target_audience': 'Millennial tech professionals who shop online',
+            'campaign_goal': 'Generate leads and signup requests',
+            'total_budget': 2000.0,
+            'duration_days': 20,
+            'product_service': 'workflow automation',
+            'website_url': 'https://example.com',
+            'preferred_platforms': ['google', 'meta', 'linkedin'],
+        }
+    
+    def test_strategy_is_a_plain_json_serializable_copy(self):
+        result = CampaignGenerator(self.user).generate_autonomous_campaign(self.brief)
+        
+        self.assertTrue(result['success'], result)
+        strategy = result['strategy']
+        json.dumps(strategy)
+        self.assertIsInstance(strategy['campaign_objectives'], dict)
+        self.assertIsInstance(strategy['content_themes'][0]['cta_options'], list)
+        
+        # Editing the copy leaves the shared tables untouched
+        strategy['campaign_objectives']['google'] = 'CHANGED'
+        again = CampaignGenerator(self.user).generate_autonomous_campaign(self.brief)
+        self.assertEqual(again['strategy']['campaign_objectives']['google'], 'SEARCH')
+    
+    def test_single_preferred_platform_gets_one_ad_set_with_the_whole_budget(self):
+        self.brief['preferred_platforms'] = ['meta']
+        generator = CampaignGenerator(self.user)
+        
+        result = generator.generate_autonomous_campaign(self.brief)
+        
+        self.assertTrue(result['success'], result)
+        campaign = result['campaign']
+        self.assertEqual(campaign.campaign_type, 'leads')
+        self.assertEqual(campaign.daily_budget, Decimal('100.00'))
+        [ad_set] = AdSet.objects.filter(campaign=campaign)
+        self.assertEqual(ad_set.platform.name, 'meta')
+        self.assertEqual(ad_set.allocated_budget, Decimal('2000.00'))
+        self.assertEqual(list(result['platform_campaigns']), ['meta'])
+        self.assertEqual(
+            sorted(ABTest.objects.filter(campaign=campaign).values_list('test_type', flat=True)),
+            ['cta', 'description', 'headline']
+        )
+        # Nothing talked to a platform API, so no service was built
+        self.assertEqual(generator.platforms._services, {})
+    
+    def test_budget_is_split_by_platform_weight(self):
+        self.brief['preferred_platforms'] = ['google', 'meta']
+        
+        result = CampaignGenerator(self.user).generate_autonomous_campaign(self.brief)
+        
+        budgets = dict(AdSet.objects.filter(campaign=result['campaign']).values_list('platform__name', 'allocated_budget'))
+        # 0.4 : 0.35 normalized over 2000
+        self.assertEqual(budgets, {'google': Decimal('1066.67'), 'meta': Decimal('933.33')})
+    
+    def test_unknown_preferred_platform_is_skipped(self):
+        self.brief['preferred_platforms'] = ['google', 'tiktok']
+        
+        result = CampaignGenerator(self.user).generate_autonomous_campaign(self.brief)
+        
+        self.assertTrue(result['success'], result)
+        self.assertEqual(list(result['platform_campaigns']), ['google'])
+        self.assertEqual(
+            list(AdSet.objects.filter(campaign=result['campaign']).values_list('platform__name', flat=True)),
+            ['google']
+        )
+    
+    def test_missing_platform_row_rolls_back_everything(self):
+        AdPlatform.objects.filter(name='linkedin').delete()
+        
+        with self.assertLogs('neuro_ads.ai.campaign_generator', level='ERROR'):
+            result = CampaignGenerator(self.user).generate_autonomous_campaign(self.brief)
+        
+        self.assertFalse(result['success'])
+        self.assertIn('linkedin', result['error'])
+        self.assertFalse(Campaign.objects.exists())
+        self.assertFalse(AdSet.objects.exists())
+        self.assertFalse(ABTest.objects.exists())
+
+
+class CampaignBriefClassificationTests(SimpleTestCase):
+    """Classifier and keyword output on representative briefs, as before the rewrite"""
+    
+    def setUp(self):
+        self.generator = CampaignGenerator.__new__(CampaignGenerator)
+    
+    def test_business_type_classification(self):
+        cases = [
+            ('Enterprise software consulting for professional services firms',
+             'B2B', 'Service', 4 / 7, (4, 0, 3, 0)),
+            ('Online retail shop selling eco-friendly consumer products. Buy sustainable goods!',
+             'B2C', 'Product', 0.5, (0, 5, 0, 2)),
+            ('A boutique marketing agency, offering brand strategy & digital services.',
+             'B2C', 'Service', 0.0, (0, 0, 2, 0)),
+        ]
+        for description, primary, secondary, confidence, indicators in cases:
+            with self.subTest(description=description):
+                result = self.generator._classify_business_type(description.lower())
+                
+                self.assertEqual((result['primary'], result['secondary']), (primary, secondary))
+                self.assertAlmostEqual(result['confidence'], confidence)
+                characteristics = result['characteristics']
+                self.assertEqual(
+                    (characteristics['b2b_indicators'], characteristics['b2c_indicators'],
+                     characteristics['service_indicators'], characteristics['product_indicators']),
+                    indicators
+                )
+    
+    def test_keyword_extraction(self):
+        description = 'Online retail shop selling eco-friendly consumer products. Buy sustainable goods!'
+        
+        keywords = self.generator._extract_keywords_from_description(description)
+        
+        self.assertEqual(keywords, [
+            'online', 'retail', 'shop', 'selling', 'eco-friendly', 'consumer', 'products', 'sustainable', 'goods'
+        ])
+        # Each caller gets its own list, not the memoized tuple
+        keywords.append('extra')
+        self.assertNotIn('extra', self.generator._extract_keywords_from_description(description))
+    
+    def test_goal_mapping(self):
+        cases = [
+            ('Generate leads and signup requests', 'leads', 'LEAD_GENERATION'),
+            ('Drive sales and purchase revenue', 'sales', 'CONVERSIONS'),
+            ('Build brand awareness', 'awareness', 'BRAND_AWARENESS'),
+            ('Increase website traffic and visits', 'traffic', 'LINK_CLICKS'),
+        ]
+        for goal, campaign_type, meta_objective in cases:
+            with self.subTest(goal=goal):
+                self.assertEqual(self.generator._map_goal_to_type(goal), campaign_type)
+                self.assertEqual(self.generator._map_campaign_objectives(goal.lower())['meta'], meta_objective)
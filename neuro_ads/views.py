@@ -105,22 +105,28 @@ def campaign_list(request):
     if search_query:
         campaigns = campaigns.filter(name__icontains=search_query)
     
-    # Add performance data
-    campaigns_with_metrics = []
-    for campaign in campaigns:
-        # Get recent metrics
-        end_date = date.today()
-        start_date = end_date - timedelta(days=7)
-        
-        metrics = CampaignAnalytics.objects.filter(
-            campaign=campaign,
+    # Get recent metrics for all listed campaigns in one grouped query
+    end_date = date.today()
+    start_date = end_date - timedelta(days=7)
+    
+    metrics_by_campaign = {
+        row['campaign_id']: row
+        for row in CampaignAnalytics.objects.filter(
+            campaign__in=campaigns,
             date__gte=start_date
-        ).aggregate(
+        ).order_by().values('campaign_id').annotate(
             total_spend=Sum('spend'),
             total_revenue=Sum('revenue'),
             total_conversions=Sum('conversions'),
             total_clicks=Sum('clicks')
         )
+    }
+    empty_metrics = {'total_spend': None, 'total_revenue': None, 'total_conversions': None, 'total_clicks': None}
+    
+    # Add performance data
+    campaigns_with_metrics = []
+    for campaign in campaigns:
+        metrics = metrics_by_campaign.get(campaign.id, empty_metrics)
         
         spend = float(metrics['total_spend'] or 0)
         revenue = float(metrics['total_revenue'] or 0)
@@ -205,7 +211,7 @@ def create_campaign(request):
 def campaign_detail(request, campaign_id):
     """Campaign detail view with analytics and controls"""
     
-    campaign = get_object_or_404(Campaign, id=campaign_id, user=request.user)
+    campaign = get_object_or_404(Campaign.objects.with_related(), id=campaign_id, user=request.user)
     
     # Get time range for analytics
     days = int(request.GET.get('days', 30))
@@ -246,16 +252,21 @@ def campaign_detail(request, campaign_id):
         'impressions': impressions,
     }
     
-    # Get ad sets with performance
-    ad_sets = []
-    for ad_set in campaign.adset_set.all():
-        ad_set_analytics = analytics.filter(ad_set=ad_set)
-        ad_set_metrics = ad_set_analytics.aggregate(
+    # Get ad sets with performance, aggregated per ad set in one query
+    metrics_by_ad_set = {
+        row['ad_set_id']: row
+        for row in analytics.order_by().values('ad_set_id').annotate(
             spend=Sum('spend'),
             revenue=Sum('revenue'),
             conversions=Sum('conversions'),
             clicks=Sum('clicks')
         )
+    }
+    empty_metrics = {'spend': None, 'revenue': None, 'conversions': None, 'clicks': None}
+    
+    ad_sets = []
+    for ad_set in campaign.adset_set.all():
+        ad_set_metrics = metrics_by_ad_set.get(ad_set.id, empty_metrics)
         
         ad_set_spend = float(ad_set_metrics['spend'] or 0)
         ad_set_revenue = float(ad_set_metrics['revenue'] or 0)
@@ -279,13 +290,16 @@ def campaign_detail(request, campaign_id):
         campaign=campaign
     ).order_by('-applied_at')[:5]
     
-    # Prepare chart data
+    # Prepare chart data from just the charted columns, which the analytics
+    # covering index serves without building model instances
+    chart_rows = list(analytics.values_list('date', 'spend', 'revenue', 'clicks', 'conversions'))
+    dates, spends, revenues, clicks_series, conversions_series = zip(*chart_rows) if chart_rows else ((), (), (), (), ())
     chart_data = {
-        'dates': [item.date.strftime('%Y-%m-%d') for item in analytics],
-        'spend': [float(item.spend) for item in analytics],
-        'revenue': [float(item.revenue) for item in analytics],
-        'clicks': [item.clicks for item in analytics],
-        'conversions': [item.conversions for item in analytics],
+        'dates': [day.strftime('%Y-%m-%d') for day in dates],
+        'spend': [float(value) for value in spends],
+        'revenue': [float(value) for value in revenues],
+        'clicks': list(clicks_series),
+        'conversions': list(conversions_series),
     }
     
     context = {
@@ -375,7 +389,7 @@ def resume_campaign(request, campaign_id):
 def ab_tests_list(request):
     """List all A/B tests"""
     
-    ab_tests = ABTest.objects.filter(campaign__user=request.user).order_by('-created_at')
+    ab_tests = ABTest.objects.filter(campaign__user=request.user).select_related('campaign').order_by('-created_at')
     
     # Add performance data
     ab_tests_with_data = []
@@ -486,17 +500,14 @@ def platform_connections(request):
     
     platforms = AdPlatform.objects.filter(is_active=True)
     
-    # Get user's credentials
-    user_credentials = {}
-    for platform in platforms:
-        try:
-            cred = PlatformCredentials.objects.get(
-                user=request.user,
-                platform=platform
-            )
-            user_credentials[platform.name] = cred
-        except PlatformCredentials.DoesNotExist:
-            user_credentials[platform.name] = None
+    # Get user's credentials; ordered so the active one, else the most
+    # recently updated inactive one, is kept per platform
+    user_credentials = {platform.name: None for platform in platforms}
+    for cred in PlatformCredentials.objects.filter(
+        user=request.user,
+        platform__in=platforms
+    ).select_related('platform').order_by('is_active', 'updated_at'):
+        user_credentials[cred.platform.name] = cred
     
     context = {
         'platforms': platforms,
@@ -1,3 +1,25 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+
 
-# Create your tests here.
+class OnboardingTests(TestCase):
+    def test_completing_onboarding_saves_every_field(self):
+        User = get_user_model()
+        user = User.objects.create_user(
+            username='alice', password='secret',
+            business_name='Acme', industry='Retail', company_size='11-50'
+        )
+        stale = user.updated_at - timedelta(days=1)
+        User.objects.filter(pk=user.pk).update(updated_at=stale)
+        self.client.force_login(user)
+        
+        response = self.client.post(reverse('users:onboarding'))
+        
+        self.assertRedirects(response, reverse('dashboard:home'), fetch_redirect_response=False)
+        user.refresh_from_db()
+        self.assertTrue(user.onboarding_completed)
+        self.assertTrue(user.profile_completed)
+        self.assertGreater(user.updated_at, stale)